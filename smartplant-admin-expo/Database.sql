@@ -79,11 +79,22 @@ CREATE TABLE iot_motion_alerts (
     gps_altitude DECIMAL(8, 2),
     gps_address TEXT,
     confidence_score DECIMAL(5, 2),
+    device_id VARCHAR(64),
+    boot_id CHAR(32),
+    alert_seq INT,
     is_read BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_created_at (created_at),
-    INDEX idx_is_read (is_read)
+    INDEX idx_is_read (is_read),
+    -- Retried alerts from a node are stored once (see backend/iot.php)
+    UNIQUE KEY uniq_device_alert (device_id, boot_id, alert_seq)
 );
+-- Existing databases: backend/setup_db.php adds device_id, boot_id, alert_seq and
+-- uniq_device_alert to an older iot_motion_alerts table without dropping it, i.e.
+--   ALTER TABLE iot_motion_alerts ADD COLUMN device_id VARCHAR(64);
+--   ALTER TABLE iot_motion_alerts ADD COLUMN boot_id CHAR(32);
+--   ALTER TABLE iot_motion_alerts ADD COLUMN alert_seq INT;
+--   ALTER TABLE iot_motion_alerts ADD UNIQUE KEY uniq_device_alert (device_id, boot_id, alert_seq);
 
 -- ================== Insert Default Users ==================
 -- Password for 'admin': admin123
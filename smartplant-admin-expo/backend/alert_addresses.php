@@ -0,0 +1,54 @@
+<?php
+// backend/alert_addresses.php - Fill in gps_address for IoT motion alerts
+// Nodes send coordinates only. iot.php stores the alert and acknowledges it right away;
+// the address is looked up afterwards (Nominatim / OpenStreetMap), never while the node waits:
+// - under PHP-FPM, iot.php runs a pass after fastcgi_finish_request()
+// - otherwise (e.g. mod_php), run this file from cron: php backend/alert_addresses.php
+require_once 'db_connect.php';
+
+// Nominatim's usage policy allows at most one request per second
+const ADDRESS_LOOKUPS_PER_PASS = 5;
+
+function reverseGeocode($lat, $lng) {
+    $url = "https://nominatim.openstreetmap.org/reverse?format=jsonv2&lat=" . urlencode($lat) . "&lon=" . urlencode($lng);
+    $context = stream_context_create(["http" => [
+        "header" => "User-Agent: smartplant-iot-backend\r\n",
+        "timeout" => 5
+    ]]);
+    $response = @file_get_contents($url, false, $context);
+    if ($response === false) {
+        return null;
+    }
+    $result = json_decode($response, true);
+    return $result['display_name'] ?? null;
+}
+
+// Resolve the newest alerts that have coordinates but no address yet; returns how many were filled
+function resolvePendingAlertAddresses($conn, $limit = ADDRESS_LOOKUPS_PER_PASS) {
+    $stmt = $conn->prepare("SELECT id, gps_latitude, gps_longitude FROM iot_motion_alerts
+        WHERE gps_address IS NULL AND gps_latitude IS NOT NULL AND gps_longitude IS NOT NULL
+        ORDER BY id DESC LIMIT :limit");
+    $stmt->bindParam(':limit', $limit, PDO::PARAM_INT);
+    $stmt->execute();
+    $pending = $stmt->fetchAll(PDO::FETCH_ASSOC);
+
+    $update = $conn->prepare("UPDATE iot_motion_alerts SET gps_address = :address WHERE id = :id");
+    $resolved = 0;
+    foreach ($pending as $i => $alert) {
+        if ($i > 0) {
+            sleep(1);
+        }
+        $address = reverseGeocode($alert['gps_latitude'], $alert['gps_longitude']);
+        if ($address !== null) {
+            $update->execute([':address' => $address, ':id' => $alert['id']]);
+            $resolved++;
+        }
+    }
+    return $resolved;
+}
+
+if (PHP_SAPI === 'cli' && realpath($_SERVER['argv'][0]) === __FILE__) {
+    $resolved = resolvePendingAlertAddresses($conn);
+    echo "Resolved $resolved alert address(es)\n";
+}
+?>
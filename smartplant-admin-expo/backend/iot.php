@@ -1,6 +1,7 @@
 <?php
 // backend/iot.php - Local PHP backend for IoT data (MySQL)
 require 'db_connect.php';
+require_once 'alert_addresses.php';
 
 // ================== CORS Headers for Hybrid Mode ==================
 // Allow requests from any origin (for Expo Web and mobile apps)
@@ -78,6 +79,62 @@ try {
             http_response_code(400);
             echo json_encode(["error" => "Invalid mode"]);
         }
+    } elseif ($method === 'POST') {
+        $data = json_decode(file_get_contents('php://input'), true);
+        if (!is_array($data)) {
+            http_response_code(400);
+            echo json_encode(["error" => "Invalid JSON body"]);
+        } elseif ($mode === 'sensor') {
+            $stmt = $conn->prepare("INSERT INTO iot_sensor_readings
+                (temperature, humidity, gps_latitude, gps_longitude, gps_altitude, gps_speed, gps_satellites)
+                VALUES (:temperature, :humidity, :lat, :lng, :altitude, :speed, :satellites)");
+            $stmt->execute([
+                ':temperature' => $data['temperature'] ?? null,
+                ':humidity' => $data['humidity'] ?? null,
+                ':lat' => $data['gps_latitude'] ?? null,
+                ':lng' => $data['gps_longitude'] ?? null,
+                ':altitude' => $data['gps_altitude'] ?? null,
+                ':speed' => $data['gps_speed'] ?? null,
+                ':satellites' => $data['gps_satellites'] ?? null
+            ]);
+            echo json_encode(["success" => true, "id" => (int)$conn->lastInsertId()]);
+        } elseif ($mode === 'alert') {
+            // (device_id, boot_id, alert_seq) is unique: a retry of an alert we already
+            // stored (e.g. after the device timed out waiting for our reply) returns the
+            // original row's id instead of inserting it twice
+            $stmt = $conn->prepare("INSERT INTO iot_motion_alerts
+                (alert_type, gps_latitude, gps_longitude, gps_altitude, confidence_score,
+                 device_id, boot_id, alert_seq)
+                VALUES (:type, :lat, :lng, :altitude, :confidence, :device_id, :boot_id, :seq)
+                ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)");
+            $stmt->execute([
+                ':type' => $data['alert_type'] ?? 'person_detected',
+                ':lat' => $data['gps_latitude'] ?? null,
+                ':lng' => $data['gps_longitude'] ?? null,
+                ':altitude' => $data['gps_altitude'] ?? null,
+                ':confidence' => $data['confidence_score'] ?? null,
+                ':device_id' => $data['device_id'] ?? null,
+                ':boot_id' => $data['boot_id'] ?? null,
+                ':seq' => $data['alert_seq'] ?? null
+            ]);
+            // rowCount() is 1 for a new row and 0 when the duplicate key matched
+            $duplicate = $stmt->rowCount() === 0;
+            echo json_encode([
+                "success" => true,
+                "id" => (int)$conn->lastInsertId(),
+                "duplicate" => $duplicate
+            ]);
+
+            // The address is filled in after the ack has gone out, on the same (kept-alive)
+            // connection; without PHP-FPM, a cron run of alert_addresses.php does it instead
+            if (!$duplicate && function_exists('fastcgi_finish_request')) {
+                fastcgi_finish_request();
+                resolvePendingAlertAddresses($conn);
+            }
+        } else {
+            http_response_code(400);
+            echo json_encode(["error" => "Invalid mode"]);
+        }
     } elseif ($method === 'PUT') {
         if ($mode === 'mark_all_read') {
             $stmt = $conn->prepare("UPDATE iot_motion_alerts SET is_read = 1 WHERE is_read = 0");
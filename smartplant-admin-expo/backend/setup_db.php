@@ -26,12 +26,39 @@ try {
         gps_altitude FLOAT,
         gps_address VARCHAR(255),
         confidence_score FLOAT,
+        device_id VARCHAR(64),
+        boot_id CHAR(32),
+        alert_seq INT,
         is_read TINYINT(1) DEFAULT 0,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uniq_device_alert (device_id, boot_id, alert_seq)
     )";
     $conn->exec($sql);
     echo "Table 'iot_motion_alerts' created successfully.<br>";
 
+    // Upgrade an iot_motion_alerts table created before alerts carried device/boot/sequence ids
+    // (iot.php's alert INSERT needs these columns and the unique key). Safe to run repeatedly.
+    $alertColumns = [
+        "device_id" => "VARCHAR(64)",
+        "boot_id" => "CHAR(32)",
+        "alert_seq" => "INT"
+    ];
+    $stmt = $conn->prepare("SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'iot_motion_alerts' AND COLUMN_NAME = :column");
+    foreach ($alertColumns as $column => $type) {
+        $stmt->execute([':column' => $column]);
+        if ((int)$stmt->fetchColumn() === 0) {
+            $conn->exec("ALTER TABLE iot_motion_alerts ADD COLUMN $column $type");
+            echo "Column 'iot_motion_alerts.$column' added.<br>";
+        }
+    }
+    $stmt = $conn->query("SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'iot_motion_alerts' AND INDEX_NAME = 'uniq_device_alert'");
+    if ((int)$stmt->fetchColumn() === 0) {
+        $conn->exec("ALTER TABLE iot_motion_alerts ADD UNIQUE KEY uniq_device_alert (device_id, boot_id, alert_seq)");
+        echo "Unique key 'iot_motion_alerts.uniq_device_alert' added.<br>";
+    }
+
     // Create sightings table
     $sql = "CREATE TABLE IF NOT EXISTS sightings (
         id INT AUTO_INCREMENT PRIMARY KEY,
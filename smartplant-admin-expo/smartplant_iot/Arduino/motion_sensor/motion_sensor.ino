@@ -24,6 +24,123 @@ const float SIM_ALTITUDE = 20.0;
 const float SIM_SPEED = 0.0;
 const int SIM_SATELLITES = 8;
 
+// ================== Serial Protocol ==================
+// 0 = human-readable text lines (default)
+// 1 = compact binary records: 0x00 | COBS(type | payload | CRC16) | 0x00
+// main.py auto-detects either format (see serial_protocol.py for the layouts).
+// Boot messages in setup() are always sent as text.
+#define BINARY_PROTOCOL 0
+
+#if BINARY_PROTOCOL
+const uint8_t REC_SENSOR = 0x01;
+const uint8_t REC_GPS = 0x02;
+const uint8_t REC_TRIGGER = 0x03;
+const uint8_t SENSOR_FLAG_OK = 0x01;
+const uint8_t GPS_FLAG_SIMULATED = 0x01;
+uint16_t triggerSeq = 0;
+
+struct __attribute__((packed)) SensorPayload {
+  uint32_t millis;
+  int16_t tempCentiC;
+  uint16_t humidityCentiPct;
+  uint8_t flags;
+};
+
+struct __attribute__((packed)) GPSPayload {
+  uint32_t millis;
+  int32_t latE7;
+  int32_t lngE7;
+  int16_t altitudeDm;
+  uint16_t speedCentiKmh;
+  uint8_t satellites;
+  uint8_t flags;
+};
+
+struct __attribute__((packed)) TriggerPayload {
+  uint32_t millis;
+  uint16_t seq;
+};
+
+// CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)
+uint16_t crc16(const uint8_t* data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// Consistent Overhead Byte Stuffing: output contains no zero bytes
+size_t cobsEncode(const uint8_t* in, size_t len, uint8_t* out) {
+  size_t writeIndex = 1;
+  size_t codeIndex = 0;
+  uint8_t code = 1;
+  for (size_t i = 0; i < len; i++) {
+    if (in[i] == 0) {
+      out[codeIndex] = code;
+      codeIndex = writeIndex++;
+      code = 1;
+    } else {
+      out[writeIndex++] = in[i];
+      code++;
+      if (code == 0xFF) {
+        out[codeIndex] = code;
+        codeIndex = writeIndex++;
+        code = 1;
+      }
+    }
+  }
+  out[codeIndex] = code;
+  return writeIndex;
+}
+
+// Send one framed record: type byte + payload + little-endian CRC16
+void sendFrame(uint8_t type, const void* payload, size_t len) {
+  uint8_t body[1 + sizeof(GPSPayload) + 2];
+  uint8_t encoded[sizeof(body) + 2];
+  body[0] = type;
+  memcpy(body + 1, payload, len);
+  uint16_t crc = crc16(body, len + 1);
+  body[len + 1] = crc & 0xFF;
+  body[len + 2] = crc >> 8;
+  size_t encodedLen = cobsEncode(body, len + 3, encoded);
+  Serial.write((uint8_t)0);
+  Serial.write(encoded, encodedLen);
+  Serial.write((uint8_t)0);
+}
+
+void sendSensorRecord(float t, float h, bool ok) {
+  SensorPayload p;
+  p.millis = millis();
+  p.tempCentiC = ok ? (int16_t)lroundf(t * 100) : 0;
+  p.humidityCentiPct = ok ? (uint16_t)lroundf(h * 100) : 0;
+  p.flags = ok ? SENSOR_FLAG_OK : 0;
+  sendFrame(REC_SENSOR, &p, sizeof(p));
+}
+
+void sendGPSRecord() {
+  GPSPayload p;
+  p.millis = millis();
+  p.latE7 = (int32_t)lround(SIM_LAT * 1e7);
+  p.lngE7 = (int32_t)lround(SIM_LNG * 1e7);
+  p.altitudeDm = (int16_t)lroundf(SIM_ALTITUDE * 10);
+  p.speedCentiKmh = (uint16_t)lroundf(SIM_SPEED * 100);
+  p.satellites = SIM_SATELLITES;
+  p.flags = GPS_FLAG_SIMULATED;
+  sendFrame(REC_GPS, &p, sizeof(p));
+}
+
+void sendTriggerRecord() {
+  TriggerPayload p;
+  p.millis = millis();
+  p.seq = triggerSeq++;
+  sendFrame(REC_TRIGGER, &p, sizeof(p));
+}
+#endif
+
 // ================== Function to send GPS data ==================
 void sendGPSData() {
   Serial.println("GPS: SIMULATION MODE");
@@ -78,10 +195,14 @@ void loop() {
   if (motionState == HIGH && !motionDetected && (now - lastMotionTime > motionCooldown)) {
     motionDetected = true;
     digitalWrite(led, HIGH);
-    Serial.println("[MOTION DETECTED!]");
     
     // Send trigger signal to Python
+#if BINARY_PROTOCOL
+    sendTriggerRecord();
+#else
+    Serial.println("[MOTION DETECTED!]");
     Serial.println("TRIGGER_CAMERA");
+#endif
     lastMotionTime = now;
     delay(3000); // pause detection for 3 seconds
     digitalWrite(led, LOW);
@@ -96,6 +217,10 @@ void loop() {
     float h = dht.readHumidity();
     float t = dht.readTemperature();
     
+#if BINARY_PROTOCOL
+    sendSensorRecord(t, h, !(isnan(h) || isnan(t)));
+    sendGPSRecord();
+#else
     Serial.println("========================================");
     Serial.print("[Time: ");
     Serial.print(now / 1000);
@@ -115,5 +240,6 @@ void loop() {
     sendGPSData();
     
     Serial.println("========================================\n");
+#endif
   }
 }
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Alert Channel - low-latency delivery of person-detection alerts
+A dedicated sender thread owns a keep-alive HTTP session to the last endpoint
+that worked, so an alert can be queued from inside the frame loop and go out
+on an already-open connection while detection carries on.
+
+Every alert carries the device id, a boot id (random, new each time the
+channel starts) and a sequence number counting up from 1 within that boot.
+Together they name the alert uniquely without trusting the wall clock. A
+POST that timed out may still have been stored, so a retry can send the alert
+twice; iot.php keeps one row per (device_id, boot_id, alert_seq).
+"""
+
+import json
+import queue
+import threading
+import time
+import uuid
+
+import requests
+
+ALERT_TIMEOUT = 2           # Seconds per POST attempt
+ALERT_MAX_ATTEMPTS = 3      # Rounds over the candidate endpoints before giving up
+RETRY_DELAY = 0.5           # Seconds between rounds
+
+class AlertEvent:
+    """Timing for one alert, from motion trigger to server acknowledgement"""
+    def __init__(self, seq, trigger_time=None):
+        self.seq = seq
+        self.trigger_time = trigger_time    # time.perf_counter() when the trigger arrived
+        self.confirmed_time = time.perf_counter()
+        self.ack_time = None
+        self.url = None
+        self.attempts = 0
+        self.error = None
+
+    def trigger_to_confirm_ms(self):
+        if self.trigger_time is None:
+            return None
+        return (self.confirmed_time - self.trigger_time) * 1000
+
+    def confirm_to_ack_ms(self):
+        if self.ack_time is None:
+            return None
+        return (self.ack_time - self.confirmed_time) * 1000
+
+    def trigger_to_ack_ms(self):
+        if self.ack_time is None or self.trigger_time is None:
+            return None
+        return (self.ack_time - self.trigger_time) * 1000
+
+class AlertChannel:
+    """Queue alerts from any thread; a sender thread POSTs them over a kept-alive session"""
+    def __init__(self, base_candidates, endpoint, device_id):
+        self.base_candidates = list(base_candidates)
+        self.endpoint = endpoint
+        self.device_id = device_id
+        self.last_good_base = None
+        self.events = []
+        self.boot_id = uuid.uuid4().hex
+        self._seq = 0
+        self._queue = queue.Queue()
+        self._session = requests.Session()
+        self._session.headers.update({'Content-Type': 'application/json', 'X-Device-Id': device_id})
+        self._thread = threading.Thread(target=self._run, name="alert-channel", daemon=True)
+        self._thread.start()
+
+    def warm(self):
+        """Open (or refresh) the keep-alive connection ahead of an alert"""
+        self._queue.put(('warm', None, None))
+
+    def send(self, payload, trigger_time=None):
+        """Queue an alert and return its AlertEvent immediately"""
+        self._seq += 1
+        event = AlertEvent(self._seq, trigger_time)
+        body = dict(payload, alert_seq=event.seq, boot_id=self.boot_id, device_id=self.device_id)
+        self.events.append(event)
+        self._queue.put(('alert', json.dumps(body, separators=(',', ':')), event))
+        return event
+
+    def close(self, timeout=5):
+        """Let queued alerts finish (up to `timeout` seconds), then stop the sender"""
+        self._queue.put(('stop', None, None))
+        self._thread.join(timeout)
+        self._session.close()
+
+    def _ordered_bases(self):
+        """Last-good endpoint first, then the other candidates"""
+        if self.last_good_base is None:
+            return self.base_candidates
+        return [self.last_good_base] + [b for b in self.base_candidates if b != self.last_good_base]
+
+    def _run(self):
+        while True:
+            kind, body, event = self._queue.get()
+            if kind == 'stop':
+                return
+            if kind == 'warm':
+                self._warm()
+            else:
+                self._deliver(body, event)
+
+    def _warm(self):
+        # iot.php answers OPTIONS straight away, so this only costs the connection set-up.
+        # A 404/500 means a misrouted or broken base: try the next one instead.
+        for base in self._ordered_bases():
+            try:
+                resp = self._session.options(base.rstrip('/') + self.endpoint, timeout=ALERT_TIMEOUT)
+            except requests.exceptions.RequestException:
+                continue
+            if resp.ok:
+                self.last_good_base = base
+                return
+
+    def _deliver(self, body, event):
+        for attempt in range(ALERT_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_DELAY)
+            for base in self._ordered_bases():
+                url = base.rstrip('/') + self.endpoint
+                event.attempts += 1
+                try:
+                    resp = self._session.post(url, data=body, timeout=ALERT_TIMEOUT)
+                except requests.exceptions.RequestException as e:
+                    event.error = str(e)
+                    continue
+                if 200 <= resp.status_code < 300:
+                    event.ack_time = time.perf_counter()
+                    event.url = url
+                    event.error = None
+                    self.last_good_base = base
+                    self._report(event)
+                    return
+                event.error = f"HTTP {resp.status_code}"
+        print(f"❌ Alert #{event.seq} not delivered after {event.attempts} attempts: {event.error}")
+
+    def _report(self, event):
+        total = event.trigger_to_ack_ms()
+        confirm = event.trigger_to_confirm_ms()
+        print(f"🚨 Person detection alert #{event.seq} acknowledged by {event.url}")
+        if total is not None:
+            print(f"[LATENCY] Alert #{event.seq}: trigger->ack {total:.0f} ms "
+                  f"(trigger->person {confirm:.0f} ms, person->ack {event.confirm_to_ack_ms():.0f} ms)")
+        else:
+            print(f"[LATENCY] Alert #{event.seq}: person->ack {event.confirm_to_ack_ms():.0f} ms")
+
+    def summary(self):
+        """Per-event latencies (ms) for every alert sent so far"""
+        def ms(value):
+            return None if value is None else round(value, 1)
+        return [{
+            'seq': e.seq,
+            'delivered': e.ack_time is not None,
+            'attempts': e.attempts,
+            'trigger_to_person_ms': ms(e.trigger_to_confirm_ms()),
+            'person_to_ack_ms': ms(e.confirm_to_ack_ms()),
+            'trigger_to_ack_ms': ms(e.trigger_to_ack_ms()),
+        } for e in self.events]
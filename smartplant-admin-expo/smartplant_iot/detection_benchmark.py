@@ -0,0 +1,162 @@
+"""
+Detection Benchmark - replay annotated clips through the detection loop
+Reports FPS, per-stage time, time-to-first-person and frame-level
+precision/recall, so speed and accuracy changes are measured together.
+
+Usage:
+    python detection_benchmark.py clips/manifest.json [--mode both] [--output results.json] [--show]
+
+--mode picks the detection mode(s) to replay: single, two_tier or both (default),
+so the two-tier scan/confirm mode can be compared against single-pass detection.
+
+Manifest format (paths are relative to the manifest file):
+    {
+      "clips": [
+        {"source": "walk_in.mp4",   "person_frames": [[45, 210]]},
+        {"source": "empty_plot/",   "person_frames": []},
+        {"source": "rtsp://127.0.0.1:8554/cam", "max_frames": 300, "person_frames": [[0, 299]]}
+      ]
+    }
+
+`person_frames` lists inclusive [first, last] frame ranges where a person is
+visible. `source` is anything frame_sources.open_frame_source() accepts.
+"""
+
+import argparse
+import json
+import os
+
+import cv2
+
+from frame_sources import open_frame_source
+from main import DETECTION_MODES, DetectionStats, MODEL_PATH, detection_loop, load_model
+
+class FrameLimit:
+    """Stop a frame source after `max_frames` frames (for endless streams)"""
+    def __init__(self, source, max_frames):
+        self.source = source
+        self.max_frames = max_frames
+        self.count = 0
+
+    def read(self):
+        if self.count >= self.max_frames:
+            return False, None
+        self.count += 1
+        return self.source.read()
+
+    def release(self):
+        self.source.release()
+
+def expand_ranges(ranges):
+    """Turn [[first, last], ...] into a set of frame indices"""
+    frames = set()
+    for first, last in ranges:
+        frames.update(range(first, last + 1))
+    return frames
+
+def score_frames(person_flags, truth_frames):
+    """Frame-level precision/recall of person detection against annotations"""
+    tp = fp = fn = 0
+    for index, detected in enumerate(person_flags):
+        actual = index in truth_frames
+        if detected and actual:
+            tp += 1
+        elif detected:
+            fp += 1
+        elif actual:
+            fn += 1
+    precision = tp / (tp + fp) if tp + fp else None
+    recall = tp / (tp + fn) if tp + fn else None
+    return {'tp': tp, 'fp': fp, 'fn': fn, 'precision': precision, 'recall': recall}
+
+def benchmark_clip(clip, base_dir, model, mode, show_window=False):
+    """Replay one clip and return its results dict (or None if it can't be opened)"""
+    spec = clip['source']
+    if '://' not in spec:
+        spec = os.path.join(base_dir, spec)
+
+    source = open_frame_source(spec)
+    if source is None:
+        return None
+    if clip.get('max_frames'):
+        source = FrameLimit(source, clip['max_frames'])
+
+    stats = DetectionStats()
+    try:
+        detection_loop(source, model, max_duration=None, no_person_timeout=None,
+                       show_window=show_window, verbose=False, stats=stats, mode=mode)
+    finally:
+        source.release()
+
+    truth = expand_ranges(clip.get('person_frames', []))
+    result = stats.summary()
+    result['source'] = clip['source']
+    result['mode'] = mode
+    result['accuracy'] = score_frames(stats.person_flags, truth)
+    # Compare first_person_frame against when a person actually enters the clip
+    result['first_annotated_person_frame'] = min(truth) if truth else None
+    return result
+
+def fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+def print_report(results):
+    print("\n" + "="*110)
+    print("📊 DETECTION BENCHMARK")
+    print("="*110)
+    print(f"{'clip':<28}{'mode':<10}{'frames':>7}{'fps':>8}{'capture':>9}{'pre':>8}{'infer':>8}{'post':>8}"
+          f"{'overlay':>9}{'TTFP s':>8}{'prec':>7}{'recall':>7}")
+    for r in results:
+        stage_ms = {stage: fmt(r['stages'].get(stage, {}).get('mean_ms'), '.1f')
+                    for stage in DetectionStats.STAGES}
+        acc = r['accuracy']
+        name = os.path.basename(r['source'].rstrip('/'))[:27]
+        print(f"{name:<28}{r['mode']:<10}{r['frames']:>7}{r['fps']:>8.1f}"
+              f"{stage_ms['capture']:>9}{stage_ms['preprocess']:>8}{stage_ms['inference']:>8}"
+              f"{stage_ms['postprocess']:>8}{stage_ms['overlay']:>9}"
+              f"{fmt(r['time_to_first_person_s'], '.2f'):>8}"
+              f"{fmt(acc['precision'], '.2f'):>7}{fmt(acc['recall'], '.2f'):>7}")
+    print("="*110)
+    print("Stage columns are mean ms per frame. TTFP = time to first person.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay annotated clips through the detection loop")
+    parser.add_argument("manifest", help="JSON manifest of clips and person annotations")
+    parser.add_argument("--model", default=MODEL_PATH, help="YOLO weights to benchmark")
+    parser.add_argument("--mode", choices=DETECTION_MODES + ("both",), default="both",
+                        help="Detection mode to replay (default: compare both)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--show", action="store_true", help="Show frames while replaying")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(args.manifest))
+
+    # Load once, so model loading isn't counted against the first clip
+    model = load_model(args.model)
+
+    modes = DETECTION_MODES if args.mode == "both" else (args.mode,)
+
+    results = []
+    for clip in manifest.get('clips', []):
+        for mode in modes:
+            print(f"\n▶️  Replaying {clip['source']} ({mode})...")
+            result = benchmark_clip(clip, base_dir, model, mode, show_window=args.show)
+            if result is None:
+                print(f"❌ Could not open {clip['source']} - skipping")
+                break
+            results.append(result)
+
+    if args.show:
+        cv2.destroyAllWindows()
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'model': args.model, 'clips': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
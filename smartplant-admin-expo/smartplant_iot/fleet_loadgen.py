@@ -0,0 +1,259 @@
+"""
+Fleet Load Generator - simulate many IoT nodes posting to the iot.php API
+Each simulated device has its own GPS track and sensor drift and posts with
+the same payload builders as main.py (iot_payloads.build_sensor_payload /
+build_alert_payload), without loading the detection stack.
+
+Usage:
+    # Against the bundled stand-in, with a 15 s server slowdown 20 s into the run
+    python fleet_loadgen.py --devices 2000 --duration 60 --standin --slowdown 20:15:1500
+
+    # Against a real deployment
+    python fleet_loadgen.py --devices 500 --target http://localhost/smartplant-admin-expo/backend
+
+Like main.py, each device waits for its POST to finish (or time out) before
+its next reading, so a slow server lowers the offered load the way a real
+fleet would. With --standin the server shares this process; for the cleanest
+numbers run iot_standin.py separately and pass its URL with --target.
+Thousands of devices need a high open-file limit (e.g. `ulimit -n 16384`).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime
+
+import aiohttp
+
+from iot_standin import add_server_arguments, server_from_args
+from iot_payloads import (API_ALERT_ENDPOINT, API_SENSOR_ENDPOINT, GPSData, SENSOR_SEND_INTERVAL,
+                          build_alert_payload, build_sensor_payload)
+
+# Swinburne University of Technology Sarawak Campus (same as the Arduino simulation)
+ORIGIN_LAT = 1.5258
+ORIGIN_LNG = 110.3542
+KM_PER_DEG_LAT = 111.32
+
+# ================== Simulated Device ==================
+class SimulatedDevice:
+    """One IoT node: a GPS track plus drifting temperature/humidity"""
+    def __init__(self, device_id, rng):
+        self.device_id = device_id
+        self.rng = rng
+
+        # Nodes are spread over ~20 km around the campus; a few move (patrols, vehicles)
+        self.gps = GPSData()
+        self.gps.lat = ORIGIN_LAT + rng.gauss(0, 0.1)
+        self.gps.lng = ORIGIN_LNG + rng.gauss(0, 0.1)
+        self.gps.altitude = rng.uniform(5, 60)
+        self.gps.satellites = rng.randint(4, 12)
+        # Pre-set, so GPSData never reverse-geocodes for a simulated node
+        self.gps.address = f"Simulated node {device_id}"
+        self.cruise_kmh = rng.choice([0.0, 0.0, 0.0, 4.0, 30.0])
+        self.gps.speed = self.cruise_kmh
+        self.heading = rng.uniform(0, 2 * math.pi)
+
+        self.temperature = rng.uniform(24, 32)
+        self.humidity = rng.uniform(55, 90)
+        # Per-device sensor bias drift (°C / %RH per hour)
+        self.temp_drift = rng.gauss(0, 0.5)
+        self.hum_drift = rng.gauss(0, 2.0)
+        self.boot_id = f"{rng.getrandbits(128):032x}"
+        self.alert_seq = 0
+
+    def step(self, dt):
+        """Advance the simulation by dt seconds"""
+        rng = self.rng
+        if self.cruise_kmh > 0:
+            self.heading += rng.gauss(0, 0.3)
+            self.gps.speed = max(0.0, self.cruise_kmh + rng.gauss(0, self.cruise_kmh * 0.2))
+            km = self.gps.speed * dt / 3600
+            self.gps.lat += km * math.cos(self.heading) / KM_PER_DEG_LAT
+            self.gps.lng += km * math.sin(self.heading) / (KM_PER_DEG_LAT * math.cos(math.radians(self.gps.lat)))
+        self.gps.satellites = min(12, max(3, self.gps.satellites + rng.choice([-1, 0, 0, 0, 1])))
+
+        hours = dt / 3600
+        self.temperature += self.temp_drift * hours + rng.gauss(0, 0.05)
+        self.humidity = min(100.0, max(0.0, self.humidity + self.hum_drift * hours + rng.gauss(0, 0.2)))
+
+    def sensor_payload(self):
+        # DHT11 readings arrive with two decimals
+        sensor = {'temperature': round(self.temperature, 2), 'humidity': round(self.humidity, 2)}
+        return build_sensor_payload(sensor, self.gps)
+
+    def alert_payload(self):
+        # Same fields AlertChannel adds in main.py
+        self.alert_seq += 1
+        payload = build_alert_payload(self.gps, datetime.utcnow().isoformat(),
+                                      confidence_score=round(self.rng.uniform(0.5, 0.95), 2))
+        return dict(payload, alert_seq=self.alert_seq, boot_id=self.boot_id, device_id=self.device_id)
+
+# ================== Statistics ==================
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class LoadStats:
+    """Every request's (time, kind, latency, outcome), summarized at the end"""
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.samples = []
+        self.device_failures = Counter()    # Exception type -> devices that stopped on it
+
+    def record(self, kind, latency_ms, outcome):
+        self.samples.append((time.monotonic() - self.started_at, kind, latency_ms, outcome))
+
+    def summarize(self, samples, duration):
+        latencies = sorted(s[2] for s in samples if s[3] == "ok")
+        errors = sum(1 for s in samples if s[3] != "ok")
+        return {
+            'requests': len(samples),
+            'rps': round(len(samples) / duration, 1) if duration > 0 else 0.0,
+            'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+            'p50_ms': percentile(latencies, 0.50),
+            'p90_ms': percentile(latencies, 0.90),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else None,
+        }
+
+    def report(self, duration, bucket_s):
+        by_kind = {kind: self.summarize([s for s in self.samples if s[1] == kind], duration)
+                   for kind in ("sensor", "alert")}
+        timeline = []
+        for start in range(0, int(math.ceil(duration)), bucket_s):
+            bucket = [s for s in self.samples if start <= s[0] < start + bucket_s]
+            timeline.append(dict(self.summarize(bucket, bucket_s), t_start=start))
+        return {
+            'duration_s': round(duration, 1),
+            'overall': self.summarize(self.samples, duration),
+            'by_kind': by_kind,
+            'outcomes': dict(Counter(s[3] for s in self.samples)),
+            'device_failures': dict(self.device_failures),
+            'timeline': timeline,
+        }
+
+# ================== Load Generation ==================
+async def post(session, url, payload, kind, device_id, stats, timeout):
+    start = time.perf_counter()
+    try:
+        async with session.post(url, json=payload, headers={'X-Device-Id': device_id},
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            await resp.read()
+            outcome = "ok" if 200 <= resp.status < 300 else f"http_{resp.status}"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+    except aiohttp.ClientError as e:
+        outcome = type(e).__name__
+    except Exception as e:
+        # Anything else (OSError, a bad payload...) is an error for this request, not the device
+        outcome = f"unexpected_{type(e).__name__}"
+    stats.record(kind, (time.perf_counter() - start) * 1000, outcome)
+
+async def run_device(device, session, base_url, stats, args, stop_at):
+    sensor_url = base_url.rstrip('/') + API_SENSOR_ENDPOINT
+    alert_url = base_url.rstrip('/') + API_ALERT_ENDPOINT
+    # Stagger start-up so the fleet doesn't post in lockstep
+    await asyncio.sleep(device.rng.uniform(0, args.interval))
+
+    next_tick = time.monotonic()
+    while next_tick < stop_at:
+        device.step(args.interval)
+        await post(session, sensor_url, device.sensor_payload(), "sensor", device.device_id, stats, args.timeout)
+        if device.rng.random() < args.alert_probability:
+            await post(session, alert_url, device.alert_payload(), "alert", device.device_id, stats, args.timeout)
+
+        # A blocked device can't post again until its previous POST returns
+        next_tick = max(next_tick + args.interval, time.monotonic())
+        await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+
+async def run_fleet(args):
+    server = None
+    base_url = args.target
+    if args.standin:
+        server = server_from_args(args)
+        base_url = await server.start("127.0.0.1", args.standin_port)
+        print(f"✅ Bundled iot.php stand-in on {base_url}")
+
+    rng = random.Random(args.seed)
+    devices = [SimulatedDevice(f"node-{i:05d}", random.Random(rng.random())) for i in range(args.devices)]
+    stats = LoadStats()
+    print(f"🚀 {args.devices} devices -> {base_url} for {args.duration}s "
+          f"(reading every {args.interval}s, alert probability {args.alert_probability})")
+
+    # Each device normally opens its own connection (requests.post without a Session)
+    connector = aiohttp.TCPConnector(limit=0, force_close=not args.keepalive)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            stop_at = time.monotonic() + args.duration
+            # One device failing must not cancel the rest of the fleet
+            results = await asyncio.gather(*(run_device(d, session, base_url, stats, args, stop_at)
+                                             for d in devices), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                stats.device_failures[type(result).__name__] += 1
+    finally:
+        if server is not None:
+            print(f"[stand-in] {server.stats()}")
+            await server.stop()
+
+    return stats.report(time.monotonic() - stats.started_at, args.bucket)
+
+def fmt_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+def print_report(report):
+    print("\n" + "="*78)
+    print("📈 FLEET LOAD REPORT")
+    print("="*78)
+    overall = report['overall']
+    print(f"Duration: {report['duration_s']}s   Requests: {overall['requests']}   "
+          f"Achieved: {overall['rps']} req/s   Errors: {overall['error_rate'] * 100:.2f}%")
+    for kind, s in report['by_kind'].items():
+        print(f"  {kind:<7} {s['requests']:>8} req  {s['rps']:>8} req/s  err {s['error_rate'] * 100:6.2f}%  "
+              f"p50 {fmt_ms(s['p50_ms'])}  p90 {fmt_ms(s['p90_ms'])}  p99 {fmt_ms(s['p99_ms'])}  "
+              f"max {fmt_ms(s['max_ms'])} ms")
+    print(f"Outcomes: {report['outcomes']}")
+    if report['device_failures']:
+        print(f"⚠️  Devices that stopped early: {report['device_failures']}")
+
+    print("\nTimeline (shows how the uplink reacts to server slowdowns):")
+    print(f"  {'t (s)':>6}{'req/s':>9}{'err %':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for b in report['timeline']:
+        print(f"  {b['t_start']:>6}{b['rps']:>9}{b['error_rate'] * 100:>8.2f}"
+              f"{fmt_ms(b['p50_ms']):>10}{fmt_ms(b['p99_ms']):>10}")
+    print("="*78)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a fleet of IoT nodes posting to iot.php")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=SENSOR_SEND_INTERVAL,
+                        help="Seconds between sensor readings per device")
+    parser.add_argument("--alert-probability", type=float, default=0.01,
+                        help="Chance of a person alert after each reading")
+    parser.add_argument("--timeout", type=float, default=5, help="Per-request timeout (main.py uses 5s)")
+    parser.add_argument("--keepalive", action="store_true", help="Reuse connections between posts")
+    parser.add_argument("--target", default="http://127.0.0.1:8090",
+                        help="Base URL that serves /iot.php (ignored with --standin)")
+    parser.add_argument("--standin", action="store_true", help="Start the bundled iot.php stand-in")
+    parser.add_argument("--standin-port", type=int, default=8090)
+    parser.add_argument("--bucket", type=int, default=5, help="Timeline bucket size in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_fleet(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
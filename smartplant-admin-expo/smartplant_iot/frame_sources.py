@@ -0,0 +1,215 @@
+"""
+Frame Sources - where the detection loop gets its frames from
+Webcam, video file, image directory or RTSP stream, all behind the same
+read()/release() interface as cv2.VideoCapture so run_detection() can be
+profiled and regression-tested without a physical camera.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+
+import cv2
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+STREAM_PREFIXES = ('rtsp://', 'rtsps://', 'rtmp://', 'http://', 'https://')
+
+# ================== Frame Source Interface ==================
+class FrameSource:
+    """Common interface for all frame sources (mirrors cv2.VideoCapture)"""
+    name = "source"
+
+    def read(self):
+        """Return (success, frame)"""
+        raise NotImplementedError
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class CaptureSource(FrameSource):
+    """Frame source backed by a cv2.VideoCapture (webcam, video file or stream)"""
+    def __init__(self, cap, name, realtime=False):
+        self.cap = cap
+        self.name = name
+        # Replay files at their native frame rate instead of as fast as possible
+        self.realtime = realtime
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        self.frame_index = 0
+        self._start = None
+
+    def read(self):
+        if self.realtime and self.fps > 0:
+            if self._start is None:
+                self._start = time.perf_counter()
+            due = self._start + self.frame_index / self.fps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        success, frame = self.cap.read()
+        if success:
+            self.frame_index += 1
+        return success, frame
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+class ImageDirectorySource(FrameSource):
+    """Frame source that replays a directory of still images in name order"""
+    def __init__(self, directory):
+        self.name = directory
+        self.paths = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.frame_index = 0
+
+    def read(self):
+        while self.frame_index < len(self.paths):
+            frame = cv2.imread(self.paths[self.frame_index])
+            self.frame_index += 1
+            if frame is not None:
+                return True, frame
+            print(f"Skipping unreadable image: {self.paths[self.frame_index - 1]}")
+        return False, None
+
+    def isOpened(self):
+        return len(self.paths) > 0
+
+# ================== Opening Sources ==================
+def open_webcam(index=None, width=640, height=480):
+    """Open a physical webcam (indices 0-2, CAP_DSHOW first) or return None"""
+    indices = [index] if index is not None else list(range(3))
+    cap = None
+
+    # Try multiple methods to open camera
+    for i in indices:
+        print(f"Trying camera index {i}...")
+        cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
+        if cap.isOpened():
+            print(f"Success! Camera {i} opened.")
+            break
+        cap.release()
+
+    # If CAP_DSHOW didn't work, try without it
+    if cap is None or not cap.isOpened():
+        print("Trying without CAP_DSHOW...")
+        for i in indices:
+            cap = cv2.VideoCapture(i)
+            if cap.isOpened():
+                print(f"Success! Camera {i} opened.")
+                break
+            cap.release()
+
+    if cap is None or not cap.isOpened():
+        return None
+
+    # Set resolution
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    return CaptureSource(cap, f"webcam:{i}")
+
+def open_frame_source(spec=None, realtime=False, webcam_resolution=(640, 480)):
+    """Open a frame source from a spec string, or return None on failure.
+
+    spec can be:
+      None / "webcam"   -> first working webcam
+      "0", "1", ...     -> that webcam index
+      "rtsp://..."      -> network stream (also rtmp/http)
+      a directory       -> images in that directory, in name order
+      a file            -> video file
+    """
+    if spec is None or spec == "webcam":
+        return open_webcam(None, *webcam_resolution)
+    if spec.isdigit():
+        return open_webcam(int(spec), *webcam_resolution)
+
+    if spec.lower().startswith(STREAM_PREFIXES):
+        print(f"Opening stream {spec}...")
+        cap = cv2.VideoCapture(spec, cv2.CAP_FFMPEG)
+        if not cap.isOpened():
+            print(f"ERROR: Could not open stream {spec}")
+            return None
+        return CaptureSource(cap, spec)
+
+    if os.path.isdir(spec):
+        source = ImageDirectorySource(spec)
+        if not source.isOpened():
+            print(f"ERROR: No images found in {spec}")
+            return None
+        return source
+
+    if os.path.isfile(spec):
+        cap = cv2.VideoCapture(spec)
+        if not cap.isOpened():
+            print(f"ERROR: Could not open video file {spec}")
+            return None
+        return CaptureSource(cap, spec, realtime=realtime)
+
+    print(f"ERROR: Unknown frame source '{spec}'")
+    return None
+
+# ================== Local RTSP Stand-in ==================
+class RTSPStandIn:
+    """Serve a video file as a looping local RTSP stream (for testing stream sources).
+
+    Needs `mediamtx` (RTSP server) and `ffmpeg` on PATH:
+
+        with RTSPStandIn("clips/walk.mp4") as url:
+            source = open_frame_source(url)
+    """
+    def __init__(self, video_path, port=8554, path="cam", startup_delay=2.0):
+        self.video_path = video_path
+        self.url = f"rtsp://127.0.0.1:{port}/{path}"
+        self.port = port
+        self.startup_delay = startup_delay
+        self._processes = []
+
+    def start(self):
+        for tool in ("mediamtx", "ffmpeg"):
+            if shutil.which(tool) is None:
+                raise RuntimeError(f"RTSP stand-in needs '{tool}' on PATH")
+
+        env = dict(os.environ, MTX_RTSPADDRESS=f":{self.port}")
+        self._processes.append(subprocess.Popen(
+            ["mediamtx"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        time.sleep(self.startup_delay / 2)
+        self._processes.append(subprocess.Popen(
+            ["ffmpeg", "-re", "-stream_loop", "-1", "-i", self.video_path,
+             "-c", "copy", "-f", "rtsp", self.url],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        time.sleep(self.startup_delay / 2)
+        return self.url
+
+    def stop(self):
+        for proc in reversed(self._processes):
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self._processes = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,220 @@
+"""
+GPS Parser - parse GPS data from the Arduino's serial output
+Shared by main.py and gps_test.py. Handles the sketch's formatted GPS_* lines
+and raw NMEA sentences (RMC, GGA, GLL from any talker: GP, GN, GL, GA, BD).
+
+Parsed values are passed to `gps.update(...)` with the keywords lat, lng,
+altitude, speed, satellites and hdop (iot_payloads.GPSData / gps_test.GPSMonitor).
+"""
+
+# NMEA sentence types that carry a position
+FIX_SENTENCES = ("RMC", "GGA", "GLL")
+
+# ================== NMEA Sentence Parsing ==================
+def parse_nmea_coordinate(nmea_coord, hemisphere):
+    """Convert NMEA DDMM.MMMM format to decimal degrees"""
+    try:
+        # NMEA format: DDMM.MMMM where DD=degrees, MM.MMMM=minutes
+        coord_float = float(nmea_coord)
+        degrees = int(coord_float / 100)
+        minutes = coord_float - (degrees * 100)
+        decimal_degrees = degrees + (minutes / 60.0)
+
+        # Apply hemisphere sign (S and W are negative)
+        if hemisphere.upper() in ['S', 'W']:
+            decimal_degrees = -decimal_degrees
+
+        return decimal_degrees
+    except (ValueError, TypeError):
+        return None
+
+def nmea_sentence_type(line):
+    """'$GNRMC,...' -> 'GNRMC' (talker + type), or None if the line isn't NMEA"""
+    if not line.startswith('$'):
+        return None
+    return line[1:].split(',', 1)[0].split('*', 1)[0] or None
+
+def nmea_checksum_ok(line):
+    """True if the sentence's *HH checksum matches (or it has none)"""
+    if '*' not in line:
+        return True
+    body, checksum = line[1:].split('*', 1)
+    calculated = 0
+    for char in body:
+        calculated ^= ord(char)
+    try:
+        return int(checksum[:2], 16) == calculated
+    except ValueError:
+        return False
+
+def parse_nmea_sentence(line, gps, verbose=True):
+    """Parse NMEA GPS sentences (GPGLL, GPRMC, etc.) and extract coordinates"""
+    try:
+        # Check if line starts with $ (NMEA sentence)
+        if not line.startswith('$'):
+            return False
+
+        # Remove checksum if present
+        if '*' in line:
+            line = line.split('*')[0]
+
+        # Split by comma
+        parts = line.split(',')
+        if len(parts) < 2:
+            return False
+
+        # Multi-constellation receivers use GN/GL/GA/BD instead of GP
+        sentence_type = parts[0][3:]
+
+        # Parse GLL sentence: $GPGLL,lat,N/S,lng,E/W,time,A/D*checksum
+        if sentence_type == 'GLL':
+            if len(parts) >= 6 and parts[1] and parts[3]:  # Check if coords exist
+                lat_raw = parts[1]
+                lat_hem = parts[2]
+                lng_raw = parts[3]
+                lng_hem = parts[4]
+                status = parts[6] if len(parts) > 6 else ''
+
+                # Only parse if status is 'A' (valid fix)
+                if status.upper() == 'A':
+                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
+                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
+
+                    if lat is not None and lng is not None:
+                        if verbose:
+                            print(f"✓ Parsed {parts[0][1:]}: Lat={lat:.6f}°, Lng={lng:.6f}°")
+                        gps.update(lat=lat, lng=lng)
+                        return True
+
+        # Parse RMC sentence: $GPRMC,time,status,lat,N/S,lng,E/W,speed,course,date,,,,
+        elif sentence_type == 'RMC':
+            if len(parts) >= 7 and parts[3] and parts[5]:  # Check if coords exist
+                status = parts[2]  # 'A' = valid, 'V' = invalid
+                lat_raw = parts[3]
+                lat_hem = parts[4]
+                lng_raw = parts[5]
+                lng_hem = parts[6]
+                speed_knots = parts[7] if len(parts) > 7 and parts[7] else None
+
+                # Only parse if status is 'A' (valid fix)
+                if status.upper() == 'A':
+                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
+                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
+
+                    if lat is not None and lng is not None:
+                        if verbose:
+                            print(f"✓ Parsed {parts[0][1:]}: Lat={lat:.6f}°, Lng={lng:.6f}°")
+                        gps.update(lat=lat, lng=lng)
+
+                        # Parse speed (knots to km/h)
+                        if speed_knots:
+                            try:
+                                speed_kmh = float(speed_knots) * 1.852
+                                gps.update(speed=speed_kmh)
+                            except ValueError:
+                                pass
+                        return True
+
+        # Parse GGA sentence for altitude: $GPGGA,time,lat,N/S,lng,E/W,quality,numSV,HDOP,alt,M,sep,M,diffAge,diffStation*checksum
+        elif sentence_type == 'GGA':
+            if len(parts) >= 10 and parts[2] and parts[4]:  # Check if coords exist
+                quality = parts[6] if len(parts) > 6 else '0'
+                lat_raw = parts[2]
+                lat_hem = parts[3]
+                lng_raw = parts[4]
+                lng_hem = parts[5]
+                altitude_str = parts[9] if len(parts) > 9 else None
+                num_satellites = parts[7] if len(parts) > 7 else None
+                hdop_str = parts[8] if len(parts) > 8 else None
+
+                # Quality: 0=no fix, 1=GPS fix, 2=DGPS fix
+                if quality and quality != '0':
+                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
+                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
+
+                    if lat is not None and lng is not None:
+                        if verbose:
+                            print(f"✓ Parsed {parts[0][1:]}: Lat={lat:.6f}°, Lng={lng:.6f}°")
+                        gps.update(lat=lat, lng=lng)
+
+                        # Parse altitude
+                        if altitude_str:
+                            try:
+                                altitude = float(altitude_str)
+                                gps.update(altitude=altitude)
+                            except ValueError:
+                                pass
+
+                        # Parse number of satellites
+                        if num_satellites:
+                            try:
+                                satellites = int(num_satellites)
+                                gps.update(satellites=satellites)
+                            except ValueError:
+                                pass
+
+                        # Parse horizontal dilution of precision
+                        if hdop_str:
+                            try:
+                                gps.update(hdop=float(hdop_str))
+                            except ValueError:
+                                pass
+                        return True
+
+    except (ValueError, IndexError, AttributeError) as e:
+        # Silently fail for NMEA parsing errors (normal for incomplete sentences)
+        pass
+
+    return False
+
+# ================== Parse Arduino GPS Data ==================
+def parse_gps_line(line, gps, verbose=True):
+    """Parse GPS data from Arduino serial output (both formatted and NMEA sentences)"""
+    # First try NMEA sentence parsing
+    if parse_nmea_sentence(line, gps, verbose):
+        return
+
+    # Then try formatted GPS_* lines
+    try:
+        # Debug: print what we're trying to parse
+        if "GPS_" in line and verbose:
+            print(f"[GPS Parser] Parsing: {line}")
+
+        if "GPS_LAT:" in line:
+            lat_str = line.split("GPS_LAT:")[1].strip()
+            lat = float(lat_str)
+            if verbose:
+                print(f"✓ Parsed Latitude: {lat}")
+            gps.update(lat=lat)
+
+        elif "GPS_LNG:" in line:
+            lng_str = line.split("GPS_LNG:")[1].strip()
+            lng = float(lng_str)
+            if verbose:
+                print(f"✓ Parsed Longitude: {lng}")
+            gps.update(lng=lng)
+
+        elif "GPS_ALTITUDE:" in line:
+            alt_str = line.split("GPS_ALTITUDE:")[1].strip().replace(" m", "")
+            altitude = float(alt_str)
+            if verbose:
+                print(f"✓ Parsed Altitude: {altitude}")
+            gps.update(altitude=altitude)
+
+        elif "GPS_SPEED:" in line:
+            speed_str = line.split("GPS_SPEED:")[1].strip().replace(" km/h", "")
+            speed = float(speed_str)
+            if verbose:
+                print(f"✓ Parsed Speed: {speed}")
+            gps.update(speed=speed)
+
+        elif "GPS_SATELLITES:" in line:
+            satellites = int(line.split("GPS_SATELLITES:")[1].strip())
+            if verbose:
+                print(f"✓ Parsed Satellites: {satellites}")
+            gps.update(satellites=satellites)
+
+    except (ValueError, IndexError) as e:
+        # Only print error for formatted GPS lines, not NMEA (normal to have many unparseable NMEA lines)
+        if "GPS_" in line:
+            print(f"❌ GPS Parse Error for line '{line}': {e}")
@@ -1,13 +1,39 @@
 """
 GPS Testing Tool - Test if your GPS is receiving data
 Run this separately to check GPS without camera/detection
+
+Usage:
+    python gps_test.py                                   # live status display
+    python gps_test.py --profile --duration 600 --json unit1.json --csv units.csv --label unit1
+    python gps_test.py --profile --record capture.txt    # also save the session for later
+    python gps_test.py --replay capture.txt --json unit1.json
+
+Profile mode measures time-to-first-fix (from opening the port, or from
+plug-in if started with the board unplugged), fix update rate, per-sentence
+rates and inter-arrival jitter, and tracks satellites/HDOP over time. Lines go
+through gps_parser.py, the same parser main.py uses, so both the sketch's GPS_*
+lines and raw NMEA are understood. Captures are text files with one
+"<seconds>\t<line>" per line; plain logs without timestamps can be replayed
+too, but then only counts are reported.
 """
 
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+
 import serial
 import serial.tools.list_ports
-import time
 from geopy.geocoders import Nominatim
 
+from gps_parser import FIX_SENTENCES, nmea_checksum_ok, nmea_sentence_type, parse_gps_line
+from serial_protocol import GPSRecord
+from serial_supervisor import SerialSupervisor, find_board
+
 class GPSMonitor:
     def __init__(self):
         self.lat = None
@@ -15,19 +41,23 @@ class GPSMonitor:
         self.altitude = None
         self.speed = None
         self.satellites = None
+        self.hdop = None
         self.updates = 0
         
-    def update(self, field, value):
-        if field == "lat":
-            self.lat = value
-        elif field == "lng":
-            self.lng = value
-        elif field == "altitude":
-            self.altitude = value
-        elif field == "speed":
-            self.speed = value
-        elif field == "satellites":
-            self.satellites = value
+    def update(self, lat=None, lng=None, altitude=None, speed=None, satellites=None, hdop=None):
+        """Called by gps_parser with whichever values a line carried"""
+        if lat is not None:
+            self.lat = lat
+        if lng is not None:
+            self.lng = lng
+        if altitude is not None:
+            self.altitude = altitude
+        if speed is not None:
+            self.speed = speed
+        if satellites is not None:
+            self.satellites = satellites
+        if hdop is not None:
+            self.hdop = hdop
         self.updates += 1
         
     def display(self):
@@ -54,6 +84,8 @@ class GPSMonitor:
                 print(f"Satellites:  {self.satellites}")
                 if self.satellites < 4:
                     print("  ⚠️  Low satellite count (need 4+ for good fix)")
+            if self.hdop is not None:
+                print(f"HDOP:        {self.hdop:.1f}")
             
             # Try to get address
             try:
@@ -67,39 +99,324 @@ class GPSMonitor:
         print("="*60)
 
 def find_arduino():
-    ports = serial.tools.list_ports.comports()
-    for port in ports:
-        if 'USB' in port.description or 'Arduino' in port.description or 'CH340' in port.description:
-            return port.device
-    return None
+    port = find_board()
+    return port.device if port is not None else None
 
 def parse_line(line, gps):
-    try:
-        if "GPS_LAT:" in line:
-            lat = float(line.split("GPS_LAT:")[1].strip())
-            gps.update("lat", lat)
-            return True
-        elif "GPS_LNG:" in line:
-            lng = float(line.split("GPS_LNG:")[1].strip())
-            gps.update("lng", lng)
-            return True
-        elif "GPS_ALTITUDE:" in line:
-            alt = float(line.split("GPS_ALTITUDE:")[1].strip().replace(" m", ""))
-            gps.update("altitude", alt)
-            return True
-        elif "GPS_SPEED:" in line:
-            speed = float(line.split("GPS_SPEED:")[1].strip().replace(" km/h", ""))
-            gps.update("speed", speed)
-            return True
-        elif "GPS_SATELLITES:" in line:
-            sats = int(line.split("GPS_SATELLITES:")[1].strip())
-            gps.update("satellites", sats)
+    """Parse one line with main.py's GPS parser; True if it carried GPS data"""
+    updates = gps.updates
+    parse_gps_line(line, gps, verbose=False)
+    return gps.updates != updates
+
+# ================== Profiling ==================
+GPS_LINE_PATTERN = re.compile(r'^(GPS_[A-Z]+):')
+CAPTURE_LINE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\t(.*)$')
+STATUS_INTERVAL = 5  # Seconds between status lines while profiling
+
+def line_type(line):
+    """'GPRMC' for NMEA, 'GPS_LAT' for the sketch's lines, None for anything else"""
+    kind = nmea_sentence_type(line)
+    if kind is not None:
+        return kind
+    match = GPS_LINE_PATTERN.match(line)
+    return match.group(1) if match else None
+
+def interval_stats(times):
+    """Inter-arrival statistics (ms) for a list of arrival times (s)"""
+    intervals = sorted((b - a) * 1000 for a, b in zip(times, times[1:]))
+    if not intervals:
+        return None
+    n = len(intervals)
+    mean = sum(intervals) / n
+    median = intervals[n // 2]
+    # Jitter: how far each interval strays from the typical (median) one
+    jitter = sorted(abs(i - median) for i in intervals)
+    return {
+        'count': n,
+        'mean_ms': round(mean, 2),
+        'std_ms': round(math.sqrt(sum((i - mean) ** 2 for i in intervals) / n), 2),
+        'min_ms': round(intervals[0], 2),
+        'p50_ms': round(median, 2),
+        'p95_ms': round(intervals[min(n - 1, int(n * 0.95))], 2),
+        'p99_ms': round(intervals[min(n - 1, int(n * 0.99))], 2),
+        'max_ms': round(intervals[-1], 2),
+        'jitter_p50_ms': round(jitter[n // 2], 2),
+        'jitter_p95_ms': round(jitter[min(n - 1, int(n * 0.95))], 2),
+        'jitter_max_ms': round(jitter[-1], 2),
+    }
+
+def value_stats(values):
+    if not values:
+        return None
+    return {'min': min(values), 'mean': round(sum(values) / len(values), 2), 'max': max(values)}
+
+class GPSProfiler:
+    """Timing statistics for a GPS stream: TTFF, fix rate, sentence rates and jitter
+
+    Lines are fed in with observe(line, t), where t is in seconds (None when a
+    capture has no timestamps). The profiler is also the target gps_parser
+    updates, so it sees exactly what main.py would extract from each line.
+    """
+    def __init__(self):
+        self.monitor = GPSMonitor()
+        self.start_time = None
+        self.last_time = None
+        self.lines = 0
+        self.sentence_counts = Counter()
+        self.sentence_times = defaultdict(list)
+        self.checksum_errors = Counter()
+        self.fix_count = 0
+        self.fix_times = []
+        self.first_fix_time = None
+        self.timeline = []          # [t, satellites, hdop] whenever either changes
+        self._kind = None
+        self._line = None
+        self._now = None
+        self._epoch = None
+
+    def start(self, t):
+        """Mark the reference time for TTFF (port opened / board plugged in)"""
+        self.start_time = t
+
+    def observe(self, line, t):
+        if self.start_time is None:
+            self.start_time = t
+        self.lines += 1
+        self.last_time = t
+        kind = line_type(line)
+        if kind is None:
+            return
+        if line.startswith('$') and not nmea_checksum_ok(line):
+            # Corrupt sentences are counted but never parsed
+            self.checksum_errors[kind] += 1
+            return
+
+        self.sentence_counts[kind] += 1
+        if t is not None:
+            self.sentence_times[kind].append(t)
+        self._kind, self._line, self._now = kind, line, t
+        parse_gps_line(line, self, verbose=False)
+
+    def observe_record(self, record, t):
+        """Binary-protocol GPSRecord (live ports only)"""
+        if self.start_time is None:
+            self.start_time = t
+        self.last_time = t
+        self.sentence_counts['GPS_RECORD'] += 1
+        self.sentence_times['GPS_RECORD'].append(t)
+        self._kind, self._line, self._now = 'GPS_RECORD', None, t
+        self.update(lat=record.lat, lng=record.lng, altitude=record.altitude,
+                    speed=record.speed, satellites=record.satellites)
+
+    def update(self, **fields):
+        """Called by gps_parser for every value it parses"""
+        self.monitor.update(**fields)
+        if 'lat' in fields and self._is_new_epoch():
+            self.fix_count += 1
+            if self._now is not None:
+                self.fix_times.append(self._now)
+                if self.first_fix_time is None:
+                    self.first_fix_time = self._now
+        if 'satellites' in fields or 'hdop' in fields:
+            sample = [self._now, self.monitor.satellites, self.monitor.hdop]
+            if self.timeline and self.timeline[-1][0] == self._now:
+                self.timeline[-1] = sample
+            elif not self.timeline or self.timeline[-1][1:] != sample[1:]:
+                self.timeline.append(sample)
+
+    def _is_new_epoch(self):
+        """RMC, GGA and GLL of one fix share a UTC time; the sketch sends one GPS_LAT per report"""
+        if self._line is None or not self._line.startswith('$'):
             return True
-    except:
-        pass
-    return False
+        parts = self._line.split('*')[0].split(',')
+        index = 5 if self._kind.endswith('GLL') else 1
+        epoch = parts[index] if len(parts) > index else ''
+        if epoch and epoch == self._epoch:
+            return False
+        self._epoch = epoch
+        return True
 
-def main():
+    def summary(self):
+        timed = self.start_time is not None and self.last_time is not None
+        duration = self.last_time - self.start_time if timed else None
+        fix_span = self.fix_times[-1] - self.fix_times[0] if len(self.fix_times) > 1 else 0
+        sentences = {}
+        for kind, count in sorted(self.sentence_counts.items()):
+            sentences[kind] = {
+                'count': count,
+                'rate_hz': round(count / duration, 3) if duration else None,
+                'interval': interval_stats(self.sentence_times[kind]),
+            }
+        return {
+            'duration_s': round(duration, 2) if duration is not None else None,
+            'lines': self.lines,
+            'ttff_s': round(self.first_fix_time - self.start_time, 2) if self.first_fix_time is not None else None,
+            'fixes': self.fix_count,
+            'fix_rate_hz': round((len(self.fix_times) - 1) / fix_span, 3) if fix_span > 0 else None,
+            'fix_interval': interval_stats(self.fix_times),
+            'sentences': sentences,
+            'checksum_errors': dict(self.checksum_errors),
+            'satellites': value_stats([s[1] for s in self.timeline if s[1] is not None]),
+            'hdop': value_stats([s[2] for s in self.timeline if s[2] is not None]),
+            'timeline': [
+                {'t_s': round(t - self.start_time, 2) if t is not None else None, 'satellites': sats, 'hdop': hdop}
+                for t, sats, hdop in self.timeline
+            ],
+        }
+
+    def status_line(self, t):
+        fix = "no fix" if self.first_fix_time is None else f"TTFF {self.first_fix_time - self.start_time:.1f}s"
+        sats = "-" if self.monitor.satellites is None else self.monitor.satellites
+        hdop = "-" if self.monitor.hdop is None else f"{self.monitor.hdop:.1f}"
+        return (f"[{t - self.start_time:7.1f}s] {fix}  fixes {self.fix_count}  sats {sats}  "
+                f"HDOP {hdop}  sentences {sum(self.sentence_counts.values())}")
+
+def read_capture(path):
+    """Yield (t, line) from a capture; t is None for lines without a timestamp"""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        for raw in f:
+            raw = raw.rstrip('\r\n')
+            match = CAPTURE_LINE_PATTERN.match(raw)
+            if match:
+                yield float(match.group(1)), match.group(2).strip()
+            else:
+                yield None, raw.strip()
+
+def profile_capture(path):
+    profiler = GPSProfiler()
+    for t, line in read_capture(path):
+        if t is not None and profiler.start_time is None:
+            # --record stamps lines relative to port open, so TTFF replays from t=0 as it did live
+            profiler.start(0.0)
+        profiler.observe(line, t)
+    return profiler
+
+def profile_port(port, duration=None, record_path=None):
+    """Profile a live port until `duration` seconds pass or Ctrl+C"""
+    profiler = GPSProfiler()
+    supervisor = SerialSupervisor(port)
+    record = open(record_path, 'w', encoding='utf-8') if record_path else None
+    try:
+        if port is None:
+            # Started unplugged: TTFF then counts from power-on
+            supervisor.wait_for_board()
+        else:
+            supervisor.open(init_delay=0)
+        start = time.monotonic()
+        profiler.start(start)
+        last_status = start
+
+        while duration is None or time.monotonic() - start < duration:
+            for item in supervisor.poll():
+                now = time.monotonic()
+                if isinstance(item, str):
+                    profiler.observe(item, now)
+                    if record is not None:
+                        record.write(f"{now - start:.3f}\t{item}\n")
+                elif isinstance(item, GPSRecord):
+                    profiler.observe_record(item, now)
+
+            if time.monotonic() - last_status >= STATUS_INTERVAL:
+                last_status = time.monotonic()
+                print(profiler.status_line(last_status))
+    except KeyboardInterrupt:
+        print("\n⏹️  Profiling stopped")
+    finally:
+        supervisor.close()
+        if record is not None:
+            record.close()
+            print(f"💾 Capture saved to {record_path}")
+    return profiler
+
+def fmt(value, suffix=""):
+    return "-" if value is None else f"{value}{suffix}"
+
+def print_profile(summary):
+    print("\n" + "="*60)
+    print("📊 GPS PROFILE")
+    print("="*60)
+    print(f"Duration:        {fmt(summary['duration_s'], ' s')}   Lines: {summary['lines']}")
+    print(f"Time to fix:     {fmt(summary['ttff_s'], ' s')}")
+    print(f"Fixes:           {summary['fixes']}   Rate: {fmt(summary['fix_rate_hz'], ' Hz')}")
+    fix_interval = summary['fix_interval']
+    if fix_interval:
+        print(f"Fix interval:    p50 {fix_interval['p50_ms']} ms   p95 {fix_interval['p95_ms']} ms   "
+              f"jitter p95 {fix_interval['jitter_p95_ms']} ms")
+    for label, key in (("Satellites", 'satellites'), ("HDOP", 'hdop')):
+        stats = summary[key]
+        if stats:
+            print(f"{label + ':':<17}min {stats['min']}   mean {stats['mean']}   max {stats['max']}")
+    if summary['checksum_errors']:
+        print(f"Checksum errors: {summary['checksum_errors']}")
+
+    print(f"\n  {'sentence':<12}{'count':>8}{'rate Hz':>10}{'p50 ms':>10}{'p95 ms':>10}{'jit p95':>10}")
+    for kind, s in summary['sentences'].items():
+        interval = s['interval'] or {}
+        print(f"  {kind:<12}{s['count']:>8}{fmt(s['rate_hz']):>10}{fmt(interval.get('p50_ms')):>10}"
+              f"{fmt(interval.get('p95_ms')):>10}{fmt(interval.get('jitter_p95_ms')):>10}")
+    print("="*60)
+
+# One row per run, so several units can be collected into one file and compared
+CSV_FIELDS = ['label', 'source', 'duration_s', 'lines', 'ttff_s', 'fixes', 'fix_rate_hz',
+              'fix_interval_p50_ms', 'fix_interval_p95_ms', 'fix_jitter_p95_ms',
+              'satellites_min', 'satellites_mean', 'satellites_max', 'hdop_min', 'hdop_mean', 'hdop_max',
+              'checksum_errors', 'sentence_rates_hz']
+
+def append_csv_row(path, label, source, summary):
+    fix_interval = summary['fix_interval'] or {}
+    satellites = summary['satellites'] or {}
+    hdop = summary['hdop'] or {}
+    row = {
+        'label': label,
+        'source': source,
+        'duration_s': summary['duration_s'],
+        'lines': summary['lines'],
+        'ttff_s': summary['ttff_s'],
+        'fixes': summary['fixes'],
+        'fix_rate_hz': summary['fix_rate_hz'],
+        'fix_interval_p50_ms': fix_interval.get('p50_ms'),
+        'fix_interval_p95_ms': fix_interval.get('p95_ms'),
+        'fix_jitter_p95_ms': fix_interval.get('jitter_p95_ms'),
+        'satellites_min': satellites.get('min'),
+        'satellites_mean': satellites.get('mean'),
+        'satellites_max': satellites.get('max'),
+        'hdop_min': hdop.get('min'),
+        'hdop_mean': hdop.get('mean'),
+        'hdop_max': hdop.get('max'),
+        'checksum_errors': sum(summary['checksum_errors'].values()),
+        'sentence_rates_hz': ";".join(f"{kind}={s['rate_hz']}" for kind, s in summary['sentences'].items()),
+    }
+    new_file = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerow(row)
+
+def run_profile(args):
+    if args.replay:
+        print(f"📼 Replaying {args.replay}")
+        profiler = profile_capture(args.replay)
+        source = args.replay
+    else:
+        port = args.port or find_arduino()
+        if port is None:
+            print("🔎 Arduino not found - plug it in now (TTFF is measured from plug-in)")
+        profiler = profile_port(port, args.duration, args.record)
+        source = port or "hot-plug"
+
+    summary = profiler.summary()
+    print_profile(summary)
+    label = args.label or source
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(dict(summary, label=label, source=source), f, indent=2)
+        print(f"💾 Summary written to {args.json}")
+    if args.csv:
+        append_csv_row(args.csv, label, source, summary)
+        print(f"💾 Row appended to {args.csv}")
+
+def monitor(port=None):
     print("="*60)
     print("🛰️  GPS TESTING TOOL")
     print("="*60)
@@ -107,7 +424,7 @@ def main():
     print("Press Ctrl+C to exit.\n")
     
     # Find Arduino
-    port = find_arduino()
+    port = port or find_arduino()
     if port is None:
         print("❌ Arduino not found!")
         print("\nAvailable ports:")
@@ -139,8 +456,8 @@ def main():
                         gps.display()
                         last_display = time.time()
                 
-                # Show all Arduino output
-                if line and not line.startswith("GPS_"):
+                # Show all Arduino output (except GPS lines and NMEA sentences)
+                if line and not line.startswith("GPS_") and not line.startswith("$"):
                     print(f"[Arduino] {line}")
                     
     except KeyboardInterrupt:
@@ -151,5 +468,22 @@ def main():
         if 'ser' in locals():
             ser.close()
 
+def main():
+    parser = argparse.ArgumentParser(description="Check and profile the GPS feed from the Arduino")
+    parser.add_argument("--port", help="Serial port (default: auto-detect)")
+    parser.add_argument("--profile", action="store_true", help="Measure TTFF, fix rate, sentence rates and jitter")
+    parser.add_argument("--replay", help="Profile a recorded capture instead of a live port")
+    parser.add_argument("--duration", type=float, help="Seconds to profile a live port (default: until Ctrl+C)")
+    parser.add_argument("--record", help="Save the live session as a capture for --replay")
+    parser.add_argument("--json", help="Write the profile summary as JSON")
+    parser.add_argument("--csv", help="Append a one-row summary to this CSV (for comparing units)")
+    parser.add_argument("--label", help="Unit/antenna name stored in the JSON/CSV output")
+    args = parser.parse_args()
+
+    if args.profile or args.replay:
+        run_profile(args)
+    else:
+        monitor(args.port)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+IoT Payloads - what a node sends to the iot.php API
+GPS state, sensor line parsing, the endpoints and the JSON payload builders,
+shared by main.py and the tools that exercise the API without a camera or
+model (fleet_loadgen.py, serial_loopback.py). Keep this module free of the
+detection stack (OpenCV, Ultralytics) so those tools stay lightweight.
+"""
+
+import time
+
+from geopy.geocoders import Nominatim
+from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
+# ================== GPS Reverse Geocoding ==================
+def get_address_from_coords(lat, lng):
+    """Convert GPS coordinates to readable address using Nominatim (OpenStreetMap)"""
+    try:
+        geolocator = Nominatim(user_agent="motion_detection_system")
+        location = geolocator.reverse(f"{lat}, {lng}", timeout=10)
+        
+        if location:
+            return location.address
+        else:
+            return "Address not found"
+    except GeocoderTimedOut:
+        return "Geocoding service timed out"
+    except GeocoderServiceError:
+        return "Geocoding service error"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+# ================== GPS Data Storage ==================
+class GPSData:
+    """Store latest GPS information"""
+    def __init__(self):
+        self.lat = None
+        self.lng = None
+        self.altitude = None
+        self.speed = None
+        self.satellites = None
+        self.hdop = None
+        self.address = None
+        self.last_update = None
+        # Last known valid coordinates (persisted while GPS lock is present)
+        self.last_valid_lat = None
+        self.last_valid_lng = None
+    
+    def update(self, lat=None, lng=None, altitude=None, speed=None, satellites=None, hdop=None):
+        """Update GPS data"""
+        if lat is not None:
+            self.lat = lat
+            # store as last valid when a real latitude is parsed
+            self.last_valid_lat = lat
+        if lng is not None:
+            self.lng = lng
+            # store as last valid when a real longitude is parsed
+            self.last_valid_lng = lng
+        if altitude is not None:
+            self.altitude = altitude
+        if speed is not None:
+            self.speed = speed
+        if satellites is not None:
+            self.satellites = satellites
+        if hdop is not None:
+            self.hdop = hdop
+        self.last_update = time.time()
+        
+        # Get address when we have valid coordinates (always update if coords change)
+        if self.lat is not None and self.lng is not None:
+            # Update address when coordinates change or if not yet fetched
+            if self.address is None:
+                print(f"🗺️  Getting address for {self.lat:.6f}, {self.lng:.6f}...")
+                self.address = get_address_from_coords(self.lat, self.lng)
+            elif hasattr(self, '_last_address_lat') and hasattr(self, '_last_address_lng'):
+                # Check if coordinates changed significantly (more than ~100m)
+                if abs(self.lat - self._last_address_lat) > 0.001 or abs(self.lng - self._last_address_lng) > 0.001:
+                    print(f"🗺️  Updating address for new location {self.lat:.6f}, {self.lng:.6f}...")
+                    self.address = get_address_from_coords(self.lat, self.lng)
+                    self._last_address_lat = self.lat
+                    self._last_address_lng = self.lng
+            else:
+                # First time address fetch
+                self._last_address_lat = self.lat
+                self._last_address_lng = self.lng
+    
+    def has_location(self):
+        """Check if we have valid GPS coordinates"""
+        return self.lat is not None and self.lng is not None
+
+    def get_best_location(self):
+        """Return the best available location tuple (lat,lng) or (None,None).
+
+        Preference order:
+        1. Current locked GPS (`self.lat`, `self.lng`) if present
+        2. Last known valid coordinates (`last_valid_lat`, `last_valid_lng`)
+        3. (None, None)
+        """
+        if self.has_location():
+            return (self.lat, self.lng)
+        if self.last_valid_lat is not None and self.last_valid_lng is not None:
+            return (self.last_valid_lat, self.last_valid_lng)
+        return (None, None)
+    
+    def print_info(self):
+        """Print formatted GPS information"""
+        if not self.has_location():
+            print("📍 GPS: No valid location data")
+            return
+        
+        print("\n" + "="*60)
+        print("📍 GPS LOCATION INFORMATION")
+        print("="*60)
+        print(f"Latitude:    {self.lat:.6f}°")
+        print(f"Longitude:   {self.lng:.6f}°")
+        if self.altitude is not None:
+            print(f"Altitude:    {self.altitude:.1f} m")
+        if self.speed is not None:
+            print(f"Speed:       {self.speed:.1f} km/h")
+        if self.satellites is not None:
+            print(f"Satellites:  {self.satellites}")
+        if self.address:
+            print(f"\n📮 Address:\n{self.address}")
+        print("="*60 + "\n")
+
+# ================== API Configuration ==================
+# Common local paths to try. The project lives under `htdocs/Admin(Expo)/...` in this workspace,
+# so requests from Python to `http://localhost/smartplant_admin/...` may fail. We try several
+# possible base URLs (including URL-encoded parentheses) and will attempt each when sending.
+API_BASE_CANDIDATES = [
+    "http://localhost/SMARTPLANT-ADMIN-EXPO/backend",     
+    "http://localhost/smartplant-admin-expo/backend",       
+    "http://localhost:8081/SMARTPLANT-ADMIN-EXPO/backend",  
+]
+
+API_SENSOR_ENDPOINT = "/iot.php?mode=sensor"
+API_ALERT_ENDPOINT = "/iot.php?mode=alert"
+
+# ================== Sensor send rate limit (for near-real-time) ==================
+# Send at most once every N seconds when sensor updates arrive from Arduino
+SENSOR_SEND_INTERVAL = 5  # seconds (adjustable)
+
+# ================== Parse Arduino Sensor Data ==================
+def parse_sensor_line(line, sensor_data):
+    """Parse temperature and humidity from Arduino serial output into `sensor_data`"""
+    try:
+        if "Temperature:" in line:
+            # Format: "Temperature: 25.50 °C  |  Humidity: 60.00 %"
+            parts = line.split("Temperature:")[1].strip()
+            temp_str = parts.split("°C")[0].strip()
+            temp = float(temp_str)
+            sensor_data['temperature'] = temp
+            
+        if "Humidity:" in line:
+            parts = line.split("Humidity:")[1].strip()
+            hum_str = parts.split("%")[0].strip()
+            humidity = float(hum_str)
+            sensor_data['humidity'] = humidity
+            
+    except (ValueError, IndexError) as e:
+        print(f"❌ Sensor Parse Error for line '{line}': {e}")
+
+# ================== Payload Builders ==================
+def build_sensor_payload(sensor_data, gps):
+    """Build the JSON body for API_SENSOR_ENDPOINT from a sensor dict and a GPSData"""
+    return {
+        'temperature': sensor_data.get('temperature'),
+        'humidity': sensor_data.get('humidity'),
+        'gps_latitude': gps.lat,
+        'gps_longitude': gps.lng,
+        'gps_altitude': gps.altitude,
+        'gps_speed': gps.speed,
+        'gps_satellites': gps.satellites
+    }
+
+def build_alert_payload(gps, device_timestamp, confidence_score=None):
+    """Build the JSON body for API_ALERT_ENDPOINT from a GPSData
+
+    Coordinates only: iot.php resolves the address itself, after acknowledging.
+    """
+    best_lat, best_lng = gps.get_best_location()
+    return {
+        'alert_type': 'person_detected',
+        'gps_latitude': best_lat,
+        'gps_longitude': best_lng,
+        'gps_altitude': gps.altitude,
+        'confidence_score': confidence_score,
+        'device_timestamp': device_timestamp  # ADD THIS
+    }
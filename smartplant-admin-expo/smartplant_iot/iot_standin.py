@@ -0,0 +1,180 @@
+"""
+IoT API Stand-in - lightweight local replacement for backend/iot.php
+Accepts POST /iot.php?mode=sensor|alert (under any path prefix), records and
+acknowledges each post, and can inject latency, slowdowns and errors so the
+uplink can be load-tested without PHP/MySQL.
+
+Usage:
+    python iot_standin.py [--port 8090] [--delay-ms 5] [--jitter-ms 5] [--error-rate 0.01]
+                          [--slowdown 30:20:1500] [--record posts.jsonl]
+
+--slowdown START:DURATION:DELAY_MS adds DELAY_MS to every response between
+START and START+DURATION seconds after the server starts (repeatable).
+GET /stats returns the counters as JSON. Alerts that repeat a (device_id,
+boot_id, alert_seq) key already accepted are acknowledged again without being
+stored.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+
+VALID_MODES = ("sensor", "alert")
+
+def parse_slowdown(spec):
+    """Parse START:DURATION:DELAY_MS into a (start_s, end_s, delay_ms) tuple"""
+    try:
+        start, duration, delay_ms = (float(part) for part in spec.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected START:DURATION:DELAY_MS, got '{spec}'")
+    return (start, start + duration, delay_ms)
+
+class StandInServer:
+    """In-memory iot.php replacement with configurable latency and failures"""
+    def __init__(self, delay_ms=0.0, jitter_ms=0.0, error_rate=0.0, slowdowns=(), record_path=None):
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slowdowns = list(slowdowns)
+        self.record_path = record_path
+        self.counts = {mode: 0 for mode in VALID_MODES}
+        self.injected_errors = 0
+        self.duplicate_alerts = 0
+        self._alert_ids = {}        # (device_id, boot_id, alert_seq) -> record id
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started_at = None
+        self._record_file = None
+        self._runner = None
+
+    def current_delay_ms(self):
+        elapsed = time.monotonic() - self.started_at
+        delay = self.delay_ms + random.uniform(0, self.jitter_ms)
+        for start, end, extra_ms in self.slowdowns:
+            if start <= elapsed < end:
+                delay += extra_ms
+        return delay
+
+    async def handle(self, request):
+        if request.method == "OPTIONS":
+            return web.json_response({})
+        if request.method == "GET" and request.path.endswith("/stats"):
+            return web.json_response(self.stats())
+        if request.method != "POST":
+            return web.json_response({"error": "Method not allowed"}, status=405)
+
+        mode = request.query.get("mode", "")
+        if mode not in VALID_MODES:
+            return web.json_response({"error": "Invalid mode"}, status=400)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.json_response({"error": "Invalid JSON"}, status=400)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay_ms = self.current_delay_ms()
+            if delay_ms > 0:
+                await asyncio.sleep(delay_ms / 1000)
+
+            if self.error_rate and random.random() < self.error_rate:
+                self.injected_errors += 1
+                return web.json_response({"error": "Injected failure"}, status=500)
+
+            dedup_key = None
+            if mode == "alert" and isinstance(payload, dict) and payload.get("alert_seq") is not None:
+                dedup_key = (payload.get("device_id"), payload.get("boot_id"), payload["alert_seq"])
+                if dedup_key in self._alert_ids:
+                    # A retry of an alert we already stored
+                    self.duplicate_alerts += 1
+                    return web.json_response({"success": True, "id": self._alert_ids[dedup_key], "duplicate": True})
+
+            self.counts[mode] += 1
+            record_id = sum(self.counts.values())
+            if dedup_key is not None:
+                self._alert_ids[dedup_key] = record_id
+            if self._record_file is not None:
+                self._record_file.write(json.dumps({
+                    "id": record_id,
+                    "mode": mode,
+                    "device": request.headers.get("X-Device-Id"),
+                    "received_at": time.time(),
+                    "payload": payload,
+                }) + "\n")
+            return web.json_response({"success": True, "id": record_id})
+        finally:
+            self.in_flight -= 1
+
+    def stats(self):
+        return {
+            "counts": dict(self.counts),
+            "injected_errors": self.injected_errors,
+            "duplicate_alerts": self.duplicate_alerts,
+            "max_in_flight": self.max_in_flight,
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+        }
+
+    def build_app(self):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+    async def start(self, host="127.0.0.1", port=8090):
+        """Start serving in the running event loop; returns the base URL"""
+        if self.record_path:
+            self._record_file = open(self.record_path, "a")
+        self.started_at = time.monotonic()
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port, backlog=4096).start()
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+def add_server_arguments(parser):
+    """Stand-in options, shared with fleet_loadgen.py"""
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Base response delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay (0..jitter)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of posts answered with HTTP 500")
+    parser.add_argument("--slowdown", type=parse_slowdown, action="append", default=[],
+                        metavar="START:DURATION:DELAY_MS", help="Add a slowdown window (repeatable)")
+    parser.add_argument("--record", help="Append every accepted post to this JSONL file")
+
+def server_from_args(args):
+    return StandInServer(args.delay_ms, args.jitter_ms, args.error_rate, args.slowdown, args.record)
+
+async def serve_forever(server, host, port):
+    base_url = await server.start(host, port)
+    print(f"✅ iot.php stand-in listening on {base_url}/iot.php?mode=sensor|alert")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"[stand-in] {server.stats()}")
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for backend/iot.php")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve_forever(server_from_args(args), args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Stand-in stopped")
+
+if __name__ == "__main__":
+    main()
@@ -6,133 +6,28 @@ import serial.tools.list_ports
 import time
 import requests
 import json
+import socket
 from datetime import datetime
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-
-# ================== GPS Reverse Geocoding ==================
-def get_address_from_coords(lat, lng):
-    """Convert GPS coordinates to readable address using Nominatim (OpenStreetMap)"""
-    try:
-        geolocator = Nominatim(user_agent="motion_detection_system")
-        location = geolocator.reverse(f"{lat}, {lng}", timeout=10)
-        
-        if location:
-            return location.address
-        else:
-            return "Address not found"
-    except GeocoderTimedOut:
-        return "Geocoding service timed out"
-    except GeocoderServiceError:
-        return "Geocoding service error"
-    except Exception as e:
-        return f"Error: {str(e)}"
+import gps_parser
+import iot_payloads
+from iot_payloads import (API_BASE_CANDIDATES, API_SENSOR_ENDPOINT, API_ALERT_ENDPOINT, SENSOR_SEND_INTERVAL,
+                          GPSData, build_sensor_payload, build_alert_payload)
+from alert_channel import AlertChannel
+from power_scheduler import ResourceScheduler
+from frame_sources import open_frame_source
+from serial_protocol import SensorRecord, GPSRecord, TriggerRecord
+from serial_supervisor import SerialSupervisor, find_board
 
 # ================== GPS Data Storage ==================
-class GPSData:
-    """Store latest GPS information"""
-    def __init__(self):
-        self.lat = None
-        self.lng = None
-        self.altitude = None
-        self.speed = None
-        self.satellites = None
-        self.address = None
-        self.last_update = None
-        # Last known valid coordinates (persisted while GPS lock is present)
-        self.last_valid_lat = None
-        self.last_valid_lng = None
-    
-    def update(self, lat=None, lng=None, altitude=None, speed=None, satellites=None):
-        """Update GPS data"""
-        if lat is not None:
-            self.lat = lat
-            # store as last valid when a real latitude is parsed
-            self.last_valid_lat = lat
-        if lng is not None:
-            self.lng = lng
-            # store as last valid when a real longitude is parsed
-            self.last_valid_lng = lng
-        if altitude is not None:
-            self.altitude = altitude
-        if speed is not None:
-            self.speed = speed
-        if satellites is not None:
-            self.satellites = satellites
-        self.last_update = time.time()
-        
-        # Get address when we have valid coordinates (always update if coords change)
-        if self.lat is not None and self.lng is not None:
-            # Update address when coordinates change or if not yet fetched
-            if self.address is None:
-                print(f"🗺️  Getting address for {self.lat:.6f}, {self.lng:.6f}...")
-                self.address = get_address_from_coords(self.lat, self.lng)
-            elif hasattr(self, '_last_address_lat') and hasattr(self, '_last_address_lng'):
-                # Check if coordinates changed significantly (more than ~100m)
-                if abs(self.lat - self._last_address_lat) > 0.001 or abs(self.lng - self._last_address_lng) > 0.001:
-                    print(f"🗺️  Updating address for new location {self.lat:.6f}, {self.lng:.6f}...")
-                    self.address = get_address_from_coords(self.lat, self.lng)
-                    self._last_address_lat = self.lat
-                    self._last_address_lng = self.lng
-            else:
-                # First time address fetch
-                self._last_address_lat = self.lat
-                self._last_address_lng = self.lng
-    
-    def has_location(self):
-        """Check if we have valid GPS coordinates"""
-        return self.lat is not None and self.lng is not None
-
-    def get_best_location(self):
-        """Return the best available location tuple (lat,lng) or (None,None).
-
-        Preference order:
-        1. Current locked GPS (`self.lat`, `self.lng`) if present
-        2. Last known valid coordinates (`last_valid_lat`, `last_valid_lng`)
-        3. (None, None)
-        """
-        if self.has_location():
-            return (self.lat, self.lng)
-        if self.last_valid_lat is not None and self.last_valid_lng is not None:
-            return (self.last_valid_lat, self.last_valid_lng)
-        return (None, None)
-    
-    def print_info(self):
-        """Print formatted GPS information"""
-        if not self.has_location():
-            print("📍 GPS: No valid location data")
-            return
-        
-        print("\n" + "="*60)
-        print("📍 GPS LOCATION INFORMATION")
-        print("="*60)
-        print(f"Latitude:    {self.lat:.6f}°")
-        print(f"Longitude:   {self.lng:.6f}°")
-        if self.altitude is not None:
-            print(f"Altitude:    {self.altitude:.1f} m")
-        if self.speed is not None:
-            print(f"Speed:       {self.speed:.1f} km/h")
-        if self.satellites is not None:
-            print(f"Satellites:  {self.satellites}")
-        if self.address:
-            print(f"\n📮 Address:\n{self.address}")
-        print("="*60 + "\n")
-
+# GPSData, the endpoints and the payload builders live in iot_payloads.py, so the
+# load generator and serial benchmarks can use them without loading the detection stack
 # Global GPS data object
 gps_data = GPSData()
 
 # ================== API Configuration ==================
-# Common local paths to try. The project lives under `htdocs/Admin(Expo)/...` in this workspace,
-# so requests from Python to `http://localhost/smartplant_admin/...` may fail. We try several
-# possible base URLs (including URL-encoded parentheses) and will attempt each when sending.
-API_BASE_CANDIDATES = [
-    "http://localhost/SMARTPLANT-ADMIN-EXPO/backend",     
-    "http://localhost/smartplant-admin-expo/backend",       
-    "http://localhost:8081/SMARTPLANT-ADMIN-EXPO/backend",  
-]
-
-API_SENSOR_ENDPOINT = "/iot.php?mode=sensor"
-API_ALERT_ENDPOINT = "/iot.php?mode=alert"
+# Base URLs and endpoints: see iot_payloads.py
+# Sent with every alert (with its boot id and sequence number) so the server can drop duplicates
+DEVICE_ID = socket.gethostname()
 
 def try_post_with_fallback(path_suffix, json_payload, timeout=5):
     """Try posting to each candidate base URL until one succeeds.
@@ -161,8 +56,6 @@ def try_post_with_fallback(path_suffix, json_payload, timeout=5):
     raise RuntimeError('All POST attempts returned non-2xx responses')
 
 # ================== Sensor send rate limit (for near-real-time) ==================
-# Send at most once every N seconds when sensor updates arrive from Arduino
-SENSOR_SEND_INTERVAL = 5  # seconds (adjustable)
 last_sensor_sent = 0
 
 # Global sensor data storage
@@ -173,39 +66,35 @@ latest_sensor_data = {
 
 # ================== Find Arduino Port ==================
 def find_arduino_port():
-    """Automatically find the Arduino port"""
-    ports = serial.tools.list_ports.comports()
-    for port in ports:
-        if 'USB' in port.description or 'Arduino' in port.description or 'CH340' in port.description:
-            return port.device
-    return None
+    """Automatically find the Arduino port (known USB VID/PIDs first, then description)"""
+    port = find_board()
+    return port.device if port is not None else None
 
 # ================== Camera Setup ==================
-def setup_camera():
-    print("Attempting to open camera...")
-    cap = None
-    
-    # Try multiple methods to open camera
-    for i in range(3):
-        print(f"Trying camera index {i}...")
-        cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-        if cap.isOpened():
-            print(f"Success! Camera {i} opened.")
-            break
-        cap.release()
+# Frame source spec: None for the webcam, or a video file, image directory or RTSP URL
+# (see frame_sources.open_frame_source)
+CAMERA_SOURCE = None
+
+# Detection mode:
+#   "single"   - every frame goes to the model once at 640x480 (original behaviour)
+#   "two_tier" - capture at full resolution, scan each frame at a small input size for
+#                cheap person proposals, and confirm candidates on full-resolution crops
+DETECTION_MODE = "single"
+DETECTION_MODES = ("single", "two_tier")
+# Webcam capture resolution per mode (file/stream sources keep their own resolution)
+CAPTURE_RESOLUTION = {
+    "single": (640, 480),
+    "two_tier": (1920, 1080),
+}
 
-    # If CAP_DSHOW didn't work, try without it
-    if cap is None or not cap.isOpened():
-        print("Trying without CAP_DSHOW...")
-        for i in range(3):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                print(f"Success! Camera {i} opened.")
-                break
-            cap.release()
+def setup_camera(source=None, mode=None):
+    print("Attempting to open camera...")
+    width, height = CAPTURE_RESOLUTION[mode or DETECTION_MODE]
+    cap = open_frame_source(source if source is not None else CAMERA_SOURCE,
+                            webcam_resolution=(width, height))
 
     # Check if we successfully opened a camera
-    if not cap.isOpened():
+    if cap is None or not cap.isOpened():
         print("ERROR: Could not open any camera!")
         print("Please check:")
         print("1. Camera permissions in Windows Settings")
@@ -213,175 +102,394 @@ def setup_camera():
         print("3. Camera drivers are installed")
         return None
 
-    # Set resolution
-    cap.set(3, 640)
-    cap.set(4, 480)
     return cap
 
 # ================== YOLO Detection Function ==================
-def run_detection(max_duration=10, no_person_timeout=5):
-    """Run YOLO detection for specified duration (seconds)
-    
-    Args:
-        max_duration: Maximum time to run detection (default 10 seconds)
-        no_person_timeout: Time to wait before closing if no person detected (default 5 seconds)
-    """
-    print("\n=== STARTING OBJECT DETECTION ===")
-    
-    # Print GPS location at start of detection (if available)
-    if gps_data.has_location():
-        print("\n📍 Current GPS Location:")
-        gps_data.print_info()
-    else:
-        print("\n⚠️  GPS data not yet available - detection will proceed without location")
-    
-    cap = setup_camera()
-    if cap is None:
-        return
-    
-    # Load model
+# Object classes
+CLASS_NAMES = ["person", "bicycle", "car", "motorbike", "aeroplane", "bus", "train", "truck", "boat",
+               "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
+               "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack", "umbrella",
+               "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball", "kite", "baseball bat",
+               "baseball glove", "skateboard", "surfboard", "tennis racket", "bottle", "wine glass", "cup",
+               "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange", "broccoli",
+               "carrot", "hot dog", "pizza", "donut", "cake", "chair", "sofa", "pottedplant", "bed",
+               "diningtable", "toilet", "tvmonitor", "laptop", "mouse", "remote", "keyboard", "cell phone",
+               "microwave", "oven", "toaster", "sink", "refrigerator", "book", "clock", "vase", "scissors",
+               "teddy bear", "hair drier", "toothbrush"]
+
+MODEL_PATH = "yolov8n.pt"
+
+def load_model(model_path=MODEL_PATH):
+    """Load the YOLO model"""
     print("Loading YOLO model...")
-    model = YOLO("yolov8n.pt") # Load pre-trained model
+    model = YOLO(model_path) # Load pre-trained model
     print("Model loaded!")
+    return model
+
+# Loaded once and kept for the life of the process (survives serial reconnects)
+loaded_models = {}
+
+def get_model(model_path=MODEL_PATH):
+    """Return the YOLO model, loading it on first use"""
+    if model_path not in loaded_models:
+        loaded_models[model_path] = load_model(model_path)
+    return loaded_models[model_path]
+
+# ================== Two-Tier Detection Settings ==================
+DEFAULT_IMGSZ = 640       # Ultralytics' own defaults, passed explicitly on every call
+DEFAULT_CONF = 0.25
+SCAN_IMGSZ = 320          # Model input size for the cheap scanning pass
+SCAN_CONF = 0.15          # Low threshold: the scan only proposes candidates
+CONFIRM_IMGSZ = 640       # Model input size for confirmation crops
+CONFIRM_CONF = 0.4        # A person must reach this on the crop to count
+CROP_MARGIN = 0.5         # Grow each proposal by this fraction of its size on every side
+CROP_MIN_SIZE = 320       # Smallest crop (pixels) taken from the full-resolution frame
+MAX_CONFIRM_CROPS = 3     # Confirmation passes per frame (highest-confidence proposals first)
+DISPLAY_WIDTH = 960       # Full-resolution frames are shrunk to this width for the window
+
+# ================== Power / Thermal Scheduling ==================
+# Steps detection down through performance tiers (model input size, frame stride,
+# session length) when the node runs hot or overloaded, and back up
+# once it recovers. See power_scheduler.py for the tiers and thresholds.
+POWER_SCHEDULER_ENABLED = True
+resource_scheduler = ResourceScheduler(enabled=POWER_SCHEDULER_ENABLED)
+
+def run_model(model, img, verbose=True, imgsz=DEFAULT_IMGSZ, conf=DEFAULT_CONF, classes=None):
+    """Run YOLO once. Returns ([(x1, y1, x2, y2, conf, cls), ...], speed_ms)"""
+    detections = []
+    speed = {'preprocess': 0.0, 'inference': 0.0, 'postprocess': 0.0}
+    # Ultralytics keeps call arguments on the model's predictor, so every setting is
+    # passed each time: otherwise a confirmation pass's classes/conf leak into the next scan
+    for r in model(img, stream=True, verbose=verbose, imgsz=imgsz, conf=conf, classes=classes):
+        # Ultralytics reports its own per-stage timings (ms) on each result
+        for stage in speed:
+            speed[stage] += (r.speed or {}).get(stage) or 0.0
+        for box in r.boxes:
+            x1, y1, x2, y2 = box.xyxy[0]
+            detections.append((int(x1), int(y1), int(x2), int(y2), float(box.conf[0]), int(box.cls[0])))
+    return detections, speed
+
+def confirmation_crops(proposals, frame_width, frame_height):
+    """Turn person proposals into padded crop regions, merging overlapping ones"""
+    crops = []
+    for x1, y1, x2, y2, conf, cls in sorted(proposals, key=lambda d: d[4], reverse=True):
+        w, h = x2 - x1, y2 - y1
+        pad_w = max(w * CROP_MARGIN, (CROP_MIN_SIZE - w) / 2)
+        pad_h = max(h * CROP_MARGIN, (CROP_MIN_SIZE - h) / 2)
+        crop = [max(0, int(x1 - pad_w)), max(0, int(y1 - pad_h)),
+                min(frame_width, int(x2 + pad_w)), min(frame_height, int(y2 + pad_h))]
+
+        for existing in crops:
+            if crop[0] < existing[2] and existing[0] < crop[2] and crop[1] < existing[3] and existing[1] < crop[3]:
+                existing[:] = [min(existing[0], crop[0]), min(existing[1], crop[1]),
+                               max(existing[2], crop[2]), max(existing[3], crop[3])]
+                break
+        else:
+            crops.append(crop)
+    return crops[:MAX_CONFIRM_CROPS]
 
-    # Object classes
-    classNames = ["person", "bicycle", "car", "motorbike", "aeroplane", "bus", "train", "truck", "boat",
-                  "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
-                  "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack", "umbrella",
-                  "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball", "kite", "baseball bat",
-                  "baseball glove", "skateboard", "surfboard", "tennis racket", "bottle", "wine glass", "cup",
-                  "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange", "broccoli",
-                  "carrot", "hot dog", "pizza", "donut", "cake", "chair", "sofa", "pottedplant", "bed",
-                  "diningtable", "toilet", "tvmonitor", "laptop", "mouse", "remote", "keyboard", "cell phone",
-                  "microwave", "oven", "toaster", "sink", "refrigerator", "book", "clock", "vase", "scissors",
-                  "teddy bear", "hair drier", "toothbrush"]
+def detect_frame(model, img, mode="single", verbose=True, imgsz=None):
+    """Run the configured detection mode on one frame.
 
-    print(f"Detection will run for max {max_duration} seconds.")
-    print(f"Will close after {no_person_timeout} seconds if no person detected.")
-    print("Press 'q' to quit early.\n")
-    
+    imgsz overrides the model input size (the confirmation size in two-tier mode,
+    which also caps the scan size). Returns (detections, speed_ms, confirm_passes);
+    detections are in frame coordinates.
+    """
+    if mode == "single":
+        detections, speed = run_model(model, img, verbose=verbose, imgsz=imgsz or DEFAULT_IMGSZ)
+        return detections, speed, 0
+
+    confirm_imgsz = imgsz or CONFIRM_IMGSZ
+    # Scan pass: small input size, low threshold, only to find candidates
+    proposals, speed = run_model(model, img, verbose=verbose, imgsz=min(SCAN_IMGSZ, confirm_imgsz),
+                                 conf=SCAN_CONF)
+    # Other objects are kept from the scan if they are confident enough on their own
+    detections = [d for d in proposals if CLASS_NAMES[d[5]] != "person" and d[4] >= CONFIRM_CONF]
+    person_proposals = [d for d in proposals if CLASS_NAMES[d[5]] == "person"]
+
+    height, width = img.shape[:2]
+    crops = confirmation_crops(person_proposals, width, height)
+    for cx1, cy1, cx2, cy2 in crops:
+        # Confirmation pass: full-resolution pixels around the candidate, persons only
+        confirmed, crop_speed = run_model(model, img[cy1:cy2, cx1:cx2], verbose=verbose,
+                                          imgsz=confirm_imgsz, conf=CONFIRM_CONF,
+                                          classes=[CLASS_NAMES.index("person")])
+        for stage in speed:
+            speed[stage] += crop_speed[stage]
+        for x1, y1, x2, y2, conf, cls in confirmed:
+            detections.append((x1 + cx1, y1 + cy1, x2 + cx1, y2 + cy1, conf, cls))
+    return detections, speed, len(crops)
+
+class DetectionStats:
+    """Per-frame stage timings and person flags collected by detection_loop()"""
+    STAGES = ("capture", "preprocess", "inference", "postprocess", "overlay")
+
+    def __init__(self):
+        self.stage_ms = {stage: [] for stage in self.STAGES}
+        self.person_flags = []          # One bool per frame read (skipped frames included)
+        self.start_time = None
+        self.end_time = None
+        self.first_person_time = None   # Seconds from start to first person
+        self.first_person_frame = None
+        self.confirm_passes = 0         # Two-tier confirmation crops run
+        self.skipped_frames = 0         # Frames shown without inference (performance tier stride)
+
+    @property
+    def frames(self):
+        return len(self.person_flags)
+
+    def record_frame(self, person_detected, stage_ms):
+        for stage, ms in stage_ms.items():
+            self.stage_ms[stage].append(ms)
+        if person_detected and self.first_person_time is None:
+            self.first_person_time = time.perf_counter() - self.start_time
+            self.first_person_frame = self.frames
+        self.person_flags.append(person_detected)
+
+    def fps(self):
+        if self.start_time is None or self.end_time is None or self.end_time <= self.start_time:
+            return 0.0
+        return self.frames / (self.end_time - self.start_time)
+
+    def summary(self):
+        """Return a JSON-friendly summary (mean/p95 ms per stage)"""
+        stages = {}
+        for stage, values in self.stage_ms.items():
+            if values:
+                ordered = sorted(values)
+                stages[stage] = {
+                    'mean_ms': round(sum(values) / len(values), 2),
+                    'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                }
+        return {
+            'frames': self.frames,
+            'fps': round(self.fps(), 2),
+            'time_to_first_person_s': None if self.first_person_time is None else round(self.first_person_time, 3),
+            'first_person_frame': self.first_person_frame,
+            'confirm_passes': self.confirm_passes,
+            'skipped_frames': self.skipped_frames,
+            'stages': stages,
+        }
+
+def detection_loop(cap, model, max_duration=10, no_person_timeout=5, show_window=True,
+                   verbose=True, stats=None, mode=None, on_person=None, scheduler=None):
+    """Run YOLO on frames from `cap` until a timeout, end of input or 'q'.
+
+    max_duration / no_person_timeout can be None to disable them (e.g. when
+    replaying a recorded clip to the end). mode is one of DETECTION_MODES
+    (default DETECTION_MODE). on_person(confidence) is called once, on the
+    first frame with a person. With a scheduler (ResourceScheduler), its
+    current tier sets the model input size and how many frames skip inference;
+    skipped frames are still shown (with the last results) and counted.
+    Returns (detected_objects, person_detected_ever).
+    """
+    mode = mode or DETECTION_MODE
     start_time = time.time()
+    if stats is not None:
+        stats.start_time = time.perf_counter()
     detected_objects = set()
     person_detected = False
     person_detected_ever = False
+    frame_index = 0
+    detections = []
     
     while True:
         elapsed_time = time.time() - start_time
         
         # Check if max duration exceeded
-        if elapsed_time > max_duration:
+        if max_duration is not None and elapsed_time > max_duration:
             print(f"\nMax detection duration ({max_duration}s) reached. Stopping...")
             break
         
         # Check if no person timeout exceeded
-        if not person_detected_ever and elapsed_time > no_person_timeout:
+        if no_person_timeout is not None and not person_detected_ever and elapsed_time > no_person_timeout:
             print(f"\nNo person detected after {no_person_timeout}s. Closing early...")
             break
             
+        capture_start = time.perf_counter()
         success, img = cap.read()
+        capture_ms = (time.perf_counter() - capture_start) * 1000
         
         if not success:
             print("Failed to read frame")
             break
-        
-        results = model(img, stream=True)# Process webcam frame
+
+        imgsz = None
+        skip_inference = False
+        if scheduler is not None:
+            tier = scheduler.update()
+            # Frame 0 of every session is always inferred: it is the one that can alert soonest
+            skip_inference = frame_index % tier.frame_stride != 0
+            frame_index += 1
+            imgsz = tier.imgsz
+
+        if skip_inference:
+            # Skipped by the current performance tier: redraw the last frame's results
+            speed, confirm_passes = {}, 0
+        else:
+            detections, speed, confirm_passes = detect_frame(model, img, mode, verbose, imgsz)
 
         # Reset person detection for this frame
         person_detected = False
+        person_confidence = 0.0
+        first_person_frame = not person_detected_ever
+        overlay_start = time.perf_counter()
 
         # Process detections
-        for r in results:
-            boxes = r.boxes
-
-            for box in boxes:
-                # Bounding box
-                x1, y1, x2, y2 = box.xyxy[0]
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-
-                # Draw box
-                cv2.rectangle(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
-
-                # Confidence
-                confidence = math.ceil((box.conf[0]*100))/100
-
-                # Class name
-                cls = int(box.cls[0])
-                obj_name = classNames[cls]
-                detected_objects.add(obj_name)
-                
-                # Check if person detected
-                if obj_name == "person":
-                    person_detected = True
-                    person_detected_ever = True
-                
-                # Display object label
-                org = [x1, y1]
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                fontScale = 0.7
-                color = (0, 0, 255) if obj_name == "person" else (255, 0, 0)  # Red for person
-                thickness = 2
-
-                label = f"{obj_name} {confidence}"
-                cv2.putText(img, label, org, font, fontScale, color, thickness)
-
-        # Show remaining time
-        if person_detected_ever:
-            remaining = int(max_duration - elapsed_time)
-            cv2.putText(img, f"Time left: {remaining}s", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        for x1, y1, x2, y2, conf, cls in detections:
+            # Draw box
+            cv2.rectangle(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
+
+            # Confidence
+            confidence = math.ceil((conf*100))/100
+
+            # Class name
+            obj_name = CLASS_NAMES[cls]
+            detected_objects.add(obj_name)
+            
+            # Check if person detected
+            if obj_name == "person":
+                person_detected = True
+                person_detected_ever = True
+                person_confidence = max(person_confidence, confidence)
+            
+            # Display object label
+            org = [x1, y1]
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            fontScale = 0.7
+            color = (0, 0, 255) if obj_name == "person" else (255, 0, 0)  # Red for person
+            thickness = 2
+
+            label = f"{obj_name} {confidence}"
+            cv2.putText(img, label, org, font, fontScale, color, thickness)
+
+        # Alert right away instead of waiting for the session to end
+        if person_detected and first_person_frame and on_person is not None:
+            on_person(person_confidence)
+
+        draw_status_overlay(img, elapsed_time, max_duration, no_person_timeout,
+                            person_detected, person_detected_ever)
+
+        quit_requested = False
+        if show_window:
+            if img.shape[1] > DISPLAY_WIDTH:
+                scale = DISPLAY_WIDTH / img.shape[1]
+                img = cv2.resize(img, (DISPLAY_WIDTH, int(img.shape[0] * scale)))
+            cv2.imshow('Motion-Triggered Detection', img)
+            quit_requested = cv2.waitKey(1) == ord('q')
+        overlay_ms = (time.perf_counter() - overlay_start) * 1000
+
+        if stats is not None:
+            stats.confirm_passes += confirm_passes
+            stats.skipped_frames += skip_inference
+            stats.record_frame(person_detected, dict(speed, capture=capture_ms, overlay=overlay_ms))
+
+        if quit_requested:
+            break
+
+    if stats is not None:
+        stats.end_time = time.perf_counter()
+    return detected_objects, person_detected_ever
+
+def draw_status_overlay(img, elapsed_time, max_duration, no_person_timeout,
+                        person_detected, person_detected_ever):
+    """Draw countdown, person status and GPS info onto the frame"""
+    # Show remaining time
+    if person_detected_ever and max_duration is not None:
+        remaining = int(max_duration - elapsed_time)
+        cv2.putText(img, f"Time left: {remaining}s", (10, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    elif not person_detected_ever and no_person_timeout is not None:
+        remaining = int(no_person_timeout - elapsed_time)
+        cv2.putText(img, f"Closing in: {remaining}s (no person)", (10, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+    
+    # Show person detection status
+    if person_detected:
+        cv2.putText(img, "PERSON DETECTED!", (10, 70), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    
+    # Show GPS coordinates on video feed (bottom left) - only if available
+    y_offset = img.shape[0] - 10
+    if gps_data.has_location():
+        # Format latitude/longitude in readable format
+        lat_dir = "N" if gps_data.lat >= 0 else "S"
+        lng_dir = "E" if gps_data.lng >= 0 else "W"
+        lat_abs = abs(gps_data.lat)
+        lng_abs = abs(gps_data.lng)
+        
+        gps_text = f"Lat: {lat_abs:.6f}{lat_dir}, Lng: {lng_abs:.6f}{lng_dir}"
+        cv2.putText(img, gps_text, (10, y_offset), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+        
+        # Show readable location if address is available
+        if gps_data.address:
+            # Truncate address if too long for display
+            addr_display = gps_data.address[:50] + "..." if len(gps_data.address) > 50 else gps_data.address
+            cv2.putText(img, f"Location: {addr_display}", (10, y_offset - 20), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+            y_offset_start = y_offset - 45
         else:
-            remaining = int(no_person_timeout - elapsed_time)
-            cv2.putText(img, f"Closing in: {remaining}s (no person)", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+            y_offset_start = y_offset - 25
         
-        # Show person detection status
-        if person_detected:
-            cv2.putText(img, "PERSON DETECTED!", (10, 70), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        # Show altitude if available
+        if gps_data.altitude is not None:
+            alt_text = f"Altitude: {gps_data.altitude:.1f}m"
+            cv2.putText(img, alt_text, (10, y_offset_start), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+            y_offset_start -= 20
         
-        # Show GPS coordinates on video feed (bottom left) - only if available
-        y_offset = img.shape[0] - 10
-        if gps_data.has_location():
-            # Format latitude/longitude in readable format
-            lat_dir = "N" if gps_data.lat >= 0 else "S"
-            lng_dir = "E" if gps_data.lng >= 0 else "W"
-            lat_abs = abs(gps_data.lat)
-            lng_abs = abs(gps_data.lng)
-            
-            gps_text = f"Lat: {lat_abs:.6f}{lat_dir}, Lng: {lng_abs:.6f}{lng_dir}"
-            cv2.putText(img, gps_text, (10, y_offset), 
+        # Show satellites if available
+        if gps_data.satellites is not None:
+            sat_text = f"Satellites: {gps_data.satellites}"
+            cv2.putText(img, sat_text, (10, y_offset_start), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-            
-            # Show readable location if address is available
-            if gps_data.address:
-                # Truncate address if too long for display
-                addr_display = gps_data.address[:50] + "..." if len(gps_data.address) > 50 else gps_data.address
-                cv2.putText(img, f"Location: {addr_display}", (10, y_offset - 20), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
-                y_offset_start = y_offset - 45
-            else:
-                y_offset_start = y_offset - 25
-            
-            # Show altitude if available
-            if gps_data.altitude is not None:
-                alt_text = f"Altitude: {gps_data.altitude:.1f}m"
-                cv2.putText(img, alt_text, (10, y_offset_start), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-                y_offset_start -= 20
-            
-            # Show satellites if available
-            if gps_data.satellites is not None:
-                sat_text = f"Satellites: {gps_data.satellites}"
-                cv2.putText(img, sat_text, (10, y_offset_start), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-        else:
-            # Show "No GPS" message
-            cv2.putText(img, "GPS: Waiting for signal...", (10, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 165, 0), 2)
+    else:
+        # Show "No GPS" message
+        cv2.putText(img, "GPS: Waiting for signal...", (10, y_offset), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 165, 0), 2)
 
-        cv2.imshow('Motion-Triggered Detection', img)
-        if cv2.waitKey(1) == ord('q'):
-            break
+def run_detection(max_duration=10, no_person_timeout=5, trigger_time=None):
+    """Run YOLO detection for specified duration (seconds)
+    
+    Args:
+        max_duration: Maximum time to run detection (default 10 seconds)
+        no_person_timeout: Time to wait before closing if no person detected (default 5 seconds)
+        trigger_time: time.perf_counter() when the motion trigger arrived (for alert latency)
+    """
+    print("\n=== STARTING OBJECT DETECTION ===")
+    
+    # Print GPS location at start of detection (if available)
+    if gps_data.has_location():
+        print("\n📍 Current GPS Location:")
+        gps_data.print_info()
+    else:
+        print("\n⚠️  GPS data not yet available - detection will proceed without location")
+    
+    cap = setup_camera()
+    if cap is None:
+        return
+    
+    # Load model (only the first trigger pays for this)
+    model = get_model()
+
+    # A hot or overloaded node runs a lighter, shorter session
+    tier = resource_scheduler.update()
+    max_duration = resource_scheduler.session_limit(max_duration)
+    if tier.name != "full":
+        print(f"Performance tier: {tier.name} (input {tier.imgsz}px, every {tier.frame_stride} frame(s))")
+
+    print(f"Detection will run for max {max_duration} seconds.")
+    print(f"Will close after {no_person_timeout} seconds if no person detected.")
+    print(f"Detection mode: {DETECTION_MODE}")
+    print("Press 'q' to quit early.\n")
+    
+    def on_person(confidence):
+        print(f"🧍 Person confirmed ({confidence:.2f}) - sending alert now")
+        send_person_alert(confidence, trigger_time)
+
+    detected_objects, person_detected_ever = detection_loop(cap, model, max_duration, no_person_timeout,
+                                                            on_person=on_person, scheduler=resource_scheduler)
 
     cap.release()
     cv2.destroyAllWindows()
@@ -390,9 +498,8 @@ def run_detection(max_duration=10, no_person_timeout=5):
     if detected_objects:
         print(f"Objects detected: {', '.join(detected_objects)}")
         if person_detected_ever:
+            # The alert already went out from the frame loop
             print("✅ Person was detected during scan")
-            # Send alert to API
-            send_person_alert()
         else:
             print("❌ No person detected")
     else:
@@ -407,218 +514,23 @@ def run_detection(max_duration=10, no_person_timeout=5):
     
     print("=" * 40 + "\n")
 
-# ================== NMEA Sentence Parsing ==================
-def parse_nmea_coordinate(nmea_coord, hemisphere):
-    """Convert NMEA DDMM.MMMM format to decimal degrees"""
-    try:
-        # NMEA format: DDMM.MMMM where DD=degrees, MM.MMMM=minutes
-        coord_float = float(nmea_coord)
-        degrees = int(coord_float / 100)
-        minutes = coord_float - (degrees * 100)
-        decimal_degrees = degrees + (minutes / 60.0)
-        
-        # Apply hemisphere sign (S and W are negative)
-        if hemisphere.upper() in ['S', 'W']:
-            decimal_degrees = -decimal_degrees
-            
-        return decimal_degrees
-    except (ValueError, TypeError):
-        return None
-
-def parse_nmea_sentence(line):
-    """Parse NMEA GPS sentences (GPGLL, GPRMC, etc.) and extract coordinates"""
-    global gps_data
-    
-    try:
-        # Check if line starts with $ (NMEA sentence)
-        if not line.startswith('$'):
-            return False
-            
-        # Remove checksum if present
-        if '*' in line:
-            line = line.split('*')[0]
-        
-        # Split by comma
-        parts = line.split(',')
-        if len(parts) < 2:
-            return False
-            
-        sentence_type = parts[0]
-        
-        # Parse GPGLL sentence: $GPGLL,lat,N/S,lng,E/W,time,A/D*checksum
-        if sentence_type == '$GPGLL':
-            if len(parts) >= 6 and parts[1] and parts[3]:  # Check if coords exist
-                lat_raw = parts[1]
-                lat_hem = parts[2]
-                lng_raw = parts[3]
-                lng_hem = parts[4]
-                status = parts[5] if len(parts) > 5 else ''
-                
-                # Only parse if status is 'A' (valid fix)
-                if status.upper() == 'A':
-                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
-                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
-                    
-                    if lat is not None and lng is not None:
-                        print(f"✓ Parsed GPGLL: Lat={lat:.6f}°, Lng={lng:.6f}°")
-                        gps_data.update(lat=lat, lng=lng)
-                        return True
-                        
-        # Parse GPRMC sentence: $GPRMC,time,status,lat,N/S,lng,E/W,speed,course,date,,,,
-        elif sentence_type == '$GPRMC':
-            if len(parts) >= 7 and parts[3] and parts[5]:  # Check if coords exist
-                status = parts[2]  # 'A' = valid, 'V' = invalid
-                lat_raw = parts[3]
-                lat_hem = parts[4]
-                lng_raw = parts[5]
-                lng_hem = parts[6]
-                speed_knots = parts[7] if len(parts) > 7 and parts[7] else None
-                
-                # Only parse if status is 'A' (valid fix)
-                if status.upper() == 'A':
-                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
-                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
-                    
-                    if lat is not None and lng is not None:
-                        print(f"✓ Parsed GPRMC: Lat={lat:.6f}°, Lng={lng:.6f}°")
-                        gps_data.update(lat=lat, lng=lng)
-                        
-                        # Parse speed (knots to km/h)
-                        if speed_knots:
-                            try:
-                                speed_kmh = float(speed_knots) * 1.852
-                                gps_data.update(speed=speed_kmh)
-                            except ValueError:
-                                pass
-                        return True
-                        
-        # Parse GPGGA sentence for altitude: $GPGGA,time,lat,N/S,lng,E/W,quality,numSV,HDOP,alt,M,sep,M,diffAge,diffStation*checksum
-        elif sentence_type == '$GPGGA':
-            if len(parts) >= 10 and parts[2] and parts[4]:  # Check if coords exist
-                quality = parts[6] if len(parts) > 6 else '0'
-                lat_raw = parts[2]
-                lat_hem = parts[3]
-                lng_raw = parts[4]
-                lng_hem = parts[5]
-                altitude_str = parts[9] if len(parts) > 9 else None
-                num_satellites = parts[7] if len(parts) > 7 else None
-                
-                # Quality: 0=no fix, 1=GPS fix, 2=DGPS fix
-                if quality and quality != '0':
-                    lat = parse_nmea_coordinate(lat_raw, lat_hem)
-                    lng = parse_nmea_coordinate(lng_raw, lng_hem)
-                    
-                    if lat is not None and lng is not None:
-                        print(f"✓ Parsed GPGGA: Lat={lat:.6f}°, Lng={lng:.6f}°")
-                        gps_data.update(lat=lat, lng=lng)
-                        
-                        # Parse altitude
-                        if altitude_str:
-                            try:
-                                altitude = float(altitude_str)
-                                gps_data.update(altitude=altitude)
-                            except ValueError:
-                                pass
-                                
-                        # Parse number of satellites
-                        if num_satellites:
-                            try:
-                                satellites = int(num_satellites)
-                                gps_data.update(satellites=satellites)
-                            except ValueError:
-                                pass
-                        return True
-                        
-    except (ValueError, IndexError, AttributeError) as e:
-        # Silently fail for NMEA parsing errors (normal for incomplete sentences)
-        pass
-    
-    return False
-
 # ================== Parse Arduino GPS Data ==================
 def parse_gps_line(line):
     """Parse GPS data from Arduino serial output (both formatted and NMEA sentences)"""
-    global gps_data
-    
-    # First try NMEA sentence parsing
-    if parse_nmea_sentence(line):
-        return
-    
-    # Then try formatted GPS_* lines
-    try:
-        # Debug: print what we're trying to parse
-        if "GPS_" in line:
-            print(f"[GPS Parser] Parsing: {line}")
-        
-        if "GPS_LAT:" in line:
-            lat_str = line.split("GPS_LAT:")[1].strip()
-            lat = float(lat_str)
-            print(f"✓ Parsed Latitude: {lat}")
-            gps_data.update(lat=lat)
-            
-        elif "GPS_LNG:" in line:
-            lng_str = line.split("GPS_LNG:")[1].strip()
-            lng = float(lng_str)
-            print(f"✓ Parsed Longitude: {lng}")
-            gps_data.update(lng=lng)
-            
-        elif "GPS_ALTITUDE:" in line:
-            alt_str = line.split("GPS_ALTITUDE:")[1].strip().replace(" m", "")
-            altitude = float(alt_str)
-            print(f"✓ Parsed Altitude: {altitude}")
-            gps_data.update(altitude=altitude)
-            
-        elif "GPS_SPEED:" in line:
-            speed_str = line.split("GPS_SPEED:")[1].strip().replace(" km/h", "")
-            speed = float(speed_str)
-            print(f"✓ Parsed Speed: {speed}")
-            gps_data.update(speed=speed)
-            
-        elif "GPS_SATELLITES:" in line:
-            satellites = int(line.split("GPS_SATELLITES:")[1].strip())
-            print(f"✓ Parsed Satellites: {satellites}")
-            gps_data.update(satellites=satellites)
-            
-    except (ValueError, IndexError) as e:
-        # Only print error for formatted GPS lines, not NMEA (normal to have many unparseable NMEA lines)
-        if "GPS_" in line:
-            print(f"❌ GPS Parse Error for line '{line}': {e}")
+    # The parsing itself lives in gps_parser.py so gps_test.py uses the same code
+    gps_parser.parse_gps_line(line, gps_data)
 
 # ================== Parse Arduino Sensor Data ==================
 def parse_sensor_line(line):
     """Parse temperature and humidity from Arduino serial output"""
-    global latest_sensor_data
-    
-    try:
-        if "Temperature:" in line:
-            # Format: "Temperature: 25.50 °C  |  Humidity: 60.00 %"
-            parts = line.split("Temperature:")[1].strip()
-            temp_str = parts.split("°C")[0].strip()
-            temp = float(temp_str)
-            latest_sensor_data['temperature'] = temp
-            
-        if "Humidity:" in line:
-            parts = line.split("Humidity:")[1].strip()
-            hum_str = parts.split("%")[0].strip()
-            humidity = float(hum_str)
-            latest_sensor_data['humidity'] = humidity
-            
-    except (ValueError, IndexError) as e:
-        print(f"❌ Sensor Parse Error for line '{line}': {e}")
+    # Shared with serial_loopback.py's parse benchmark (see iot_payloads.py)
+    iot_payloads.parse_sensor_line(line, latest_sensor_data)
 
 # ================== Send Sensor Reading to API ==================
 def send_sensor_reading():
     """Send current sensor reading to PHP API"""
     try:
-        payload = {
-            'temperature': latest_sensor_data.get('temperature'),
-            'humidity': latest_sensor_data.get('humidity'),
-            'gps_latitude': gps_data.lat,
-            'gps_longitude': gps_data.lng,
-            'gps_altitude': gps_data.altitude,
-            'gps_speed': gps_data.speed,
-            'gps_satellites': gps_data.satellites
-        }
+        payload = build_sensor_payload(latest_sensor_data, gps_data)
 
         resp = try_post_with_fallback(API_SENSOR_ENDPOINT, payload, timeout=5)
         if resp is not None and 200 <= resp.status_code < 300:
@@ -627,99 +539,161 @@ def send_sensor_reading():
         print(f"❌ Failed to send sensor reading to API: {e}")
 
 # ================== Send Person Detection Alert to API ==================
-def send_person_alert():
-    """Send person detection alert with GPS location to PHP API"""
-    best_lat, best_lng = gps_data.get_best_location()
-    
+# Alerts bypass try_post_with_fallback(): a sender thread keeps a connection open
+# to the last endpoint that worked (see alert_channel.py)
+alert_channel = None
+
+def get_alert_channel():
+    """Return the alert channel, starting it on first use"""
+    global alert_channel
+    if alert_channel is None:
+        alert_channel = AlertChannel(API_BASE_CANDIDATES, API_ALERT_ENDPOINT, DEVICE_ID)
+    return alert_channel
+
+def send_person_alert(confidence_score=None, trigger_time=None):
+    """Queue a person detection alert with GPS location for the PHP API (returns immediately)"""
     # TIMESTAMP: Capture when alert is sent from device
     device_timestamp = datetime.utcnow().isoformat()
     
+    payload = build_alert_payload(gps_data, device_timestamp, confidence_score)
+    event = get_alert_channel().send(payload, trigger_time)
+    print(f"[LATENCY] Sending alert #{event.seq} at {device_timestamp}")
+    return event
+
+# ================== Arduino Monitor Thread ==================
+def maybe_send_sensor_reading():
+    """Send the latest sensor reading, at most once every SENSOR_SEND_INTERVAL seconds"""
+    global last_sensor_sent
     try:
-        payload = {
-            'alert_type': 'person_detected',
-            'gps_latitude': best_lat,
-            'gps_longitude': best_lng,
-            'gps_altitude': gps_data.altitude,
-            'gps_address': gps_data.address,
-            'confidence_score': None,
-            'device_timestamp': device_timestamp  # ADD THIS
-        }
-        
-        print(f"[LATENCY] Sending alert at {device_timestamp}")
-        resp = try_post_with_fallback(API_ALERT_ENDPOINT, payload, timeout=5)
-        if resp is not None and 200 <= resp.status_code < 300:
-            print("🚨 Person detection alert sent to admin dashboard!")
+        now = time.time()
+        if latest_sensor_data.get('temperature') is not None and (now - last_sensor_sent) >= SENSOR_SEND_INTERVAL:
+            send_sensor_reading()
+            last_sensor_sent = now
     except Exception as e:
-        print(f"❌ Failed to send alert to API: {e}")
+        print(f"Error while attempting immediate sensor POST: {e}")
+
+def on_motion_trigger(max_duration, no_person_timeout):
+    """Start a detection session for a motion trigger - NO GPS WAIT REQUIRED!"""
+    trigger_time = time.perf_counter()
+    # Refresh the alert connection while the camera opens (servers close idle ones)
+    get_alert_channel().warm()
+    print("\n" + "="*50)
+    print("🚨 MOTION DETECTED - STARTING CAMERA!")
+    if gps_data.has_location():
+        print("✅ GPS data available")
+    else:
+        print("⚠️  GPS data not yet available (will continue anyway)")
+    print("="*50)
+    
+    run_detection(max_duration, no_person_timeout, trigger_time)
+    print("Waiting for next motion detection...\n")
+
+def handle_text_line(line, max_duration, no_person_timeout):
+    """Handle one line from the Arduino's text protocol"""
+    # Continue parsing GPS data in background
+    parse_gps_line(line)
+    
+    # Parse sensor data (temperature, humidity)
+    if "Temperature:" in line or "Humidity:" in line:
+        parse_sensor_line(line)
+        # Send sensor reading immediately with rate limit
+        maybe_send_sensor_reading()
+    
+    # Show GPS status updates when coordinates are first received
+    if "GPS_LAT:" in line or "GPS_LNG:" in line:
+        if gps_data.has_location():
+            print(f"📍 GPS LOCKED: {gps_data.lat:.6f}°, {gps_data.lng:.6f}°")
+            # Print full GPS info on first lock
+            if gps_data.last_update is not None and time.time() - gps_data.last_update < 2:
+                gps_data.print_info()
+    
+    # Print all Arduino messages (except GPS lines and NMEA sentences to reduce spam)
+    if "GPS_" not in line and not line.startswith('$'):
+        print(f"[Arduino] {line}")
+    
+    # Send sensor reading when we have complete data (every 10 seconds from Arduino)
+    if "========================================" in line and latest_sensor_data.get('temperature') is not None:
+        send_sensor_reading()
+    
+    # Check for motion trigger
+    if "TRIGGER_CAMERA" in line:
+        on_motion_trigger(max_duration, no_person_timeout)
+
+def handle_record(record, max_duration, no_person_timeout):
+    """Handle one decoded record from the Arduino's binary protocol"""
+    if isinstance(record, SensorRecord):
+        if not record.ok:
+            print("[Arduino] DHT11: Failed to read!")
+            return
+        latest_sensor_data['temperature'] = record.temperature
+        latest_sensor_data['humidity'] = record.humidity
+        print(f"[Arduino] Temperature: {record.temperature:.2f} °C  |  Humidity: {record.humidity:.2f} %")
+        maybe_send_sensor_reading()
+
+    elif isinstance(record, GPSRecord):
+        had_location = gps_data.has_location()
+        gps_data.update(lat=record.lat, lng=record.lng, altitude=record.altitude,
+                        speed=record.speed, satellites=record.satellites)
+        if not had_location:
+            print(f"📍 GPS LOCKED: {gps_data.lat:.6f}°, {gps_data.lng:.6f}°")
+            gps_data.print_info()
+
+    elif isinstance(record, TriggerRecord):
+        print(f"[Arduino] [MOTION DETECTED!] (trigger #{record.seq})")
+        on_motion_trigger(max_duration, no_person_timeout)
 
-# ================== Arduino Monitor Thread ==================
 def monitor_arduino(arduino_port, max_duration=10, no_person_timeout=5):
-    """Monitor Arduino serial for motion trigger and GPS data"""
+    """Monitor Arduino serial for motion trigger and GPS data
+
+    arduino_port may be None to wait for the board to be plugged in. If the
+    board resets or is unplugged later, the supervisor reopens it (on whatever
+    port it comes back on) and monitoring carries on.
+    """
+    # Remembers the board's VID/PID/serial number and reconnects on failure;
+    # decodes both the text protocol and the binary one (auto-detected)
+    supervisor = SerialSupervisor(arduino_port)
     try:
-        ser = serial.Serial(arduino_port, 115200, timeout=1)
-        print(f"Connected to Arduino on {arduino_port}")
+        if arduino_port is None:
+            supervisor.wait_for_board()
+        else:
+            supervisor.open()  # Waits 2s for the Arduino to initialize (first connection only)
         print("GPS data will be collected in background...")
         print("Motion detection is ACTIVE - camera will trigger immediately!\n")
+        get_alert_channel().warm()
         
-        time.sleep(2)  # Wait for Arduino to initialize
+        mode = None
         
         while True:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                
-                # Continue parsing GPS data in background
-                parse_gps_line(line)
-                
-                # Parse sensor data (temperature, humidity)
-                if "Temperature:" in line or "Humidity:" in line:
-                    parse_sensor_line(line)
-                    # Send sensor reading immediately with rate limit
-                    try:
-                        now = time.time()
-                        # use global last_sensor_sent variable
-                        global last_sensor_sent
-                        if latest_sensor_data.get('temperature') is not None and (now - last_sensor_sent) >= SENSOR_SEND_INTERVAL:
-                            send_sensor_reading()
-                            last_sensor_sent = now
-                    except Exception as e:
-                        print(f"Error while attempting immediate sensor POST: {e}")
-                
-                # Show GPS status updates when coordinates are first received
-                if "GPS_LAT:" in line or "GPS_LNG:" in line:
-                    if gps_data.has_location():
-                        print(f"📍 GPS LOCKED: {gps_data.lat:.6f}°, {gps_data.lng:.6f}°")
-                        # Print full GPS info on first lock
-                        if gps_data.last_update is not None and time.time() - gps_data.last_update < 2:
-                            gps_data.print_info()
-                
-                # Print all Arduino messages (except GPS lines and NMEA sentences to reduce spam)
-                if "GPS_" not in line and not line.startswith('$'):
-                    print(f"[Arduino] {line}")
-                
-                # Send sensor reading when we have complete data (every 10 seconds from Arduino)
-                if "========================================" in line and latest_sensor_data.get('temperature') is not None:
-                    send_sensor_reading()
-                
-                # Check for motion trigger - NO GPS WAIT REQUIRED!
-                if "TRIGGER_CAMERA" in line:
-                    print("\n" + "="*50)
-                    print("🚨 MOTION DETECTED - STARTING CAMERA!")
-                    if gps_data.has_location():
-                        print("✅ GPS data available")
-                    else:
-                        print("⚠️  GPS data not yet available (will continue anyway)")
-                    print("="*50)
-                    
-                    run_detection(max_duration, no_person_timeout)
-                    print("Waiting for next motion detection...\n")
+            items = supervisor.poll()
+            for item in items:
+                if isinstance(item, str):
+                    handle_text_line(item, max_duration, no_person_timeout)
+                else:
+                    handle_record(item, max_duration, no_person_timeout)
+
+            # Keep the tier current between sessions. No extra idle sleep: poll() already
+            # blocks in the serial read (1 s timeout) and returns as soon as a trigger arrives
+            resource_scheduler.update()
+
+            # A reconnect starts a fresh decoder, so this is re-announced after one
+            if supervisor.reader.mode != mode and supervisor.reader.bytes_received:
+                mode = supervisor.reader.mode
+                print(f"📦 Arduino is using the {mode} serial protocol")
                     
     except serial.SerialException as e:
         print(f"Error connecting to Arduino: {e}")
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
-        if 'ser' in locals():
-            ser.close()
+        supervisor.close()
+        if supervisor.metrics.disconnects:
+            print(f"🔌 Serial reconnects: {supervisor.metrics.summary()}")
+        if resource_scheduler.transitions:
+            print(f"🌡️  Performance tiers: {resource_scheduler.metrics()}")
+        if alert_channel is not None:
+            alert_channel.close()
+            for event in alert_channel.summary():
+                print(f"[LATENCY] {event}")
 
 # ================== Main Program ==================
 if __name__ == "__main__":
@@ -737,13 +711,12 @@ if __name__ == "__main__":
         for port in ports:
             print(f"  - {port.device}: {port.description}")
         
-        manual_port = input("\nEnter port manually (e.g., COM3) or press Enter to exit: ")
+        manual_port = input("\nEnter port manually (e.g., COM3) or press Enter to wait for it: ")
         if manual_port:
             arduino_port = manual_port
-        else:
-            exit()
     
-    print(f"\nUsing Arduino port: {arduino_port}")
+    if arduino_port is not None:
+        print(f"\nUsing Arduino port: {arduino_port}")
     
     # Configure detection times
     max_duration = 10  # Maximum detection time
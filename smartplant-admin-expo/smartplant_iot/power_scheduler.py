@@ -0,0 +1,154 @@
+"""
+Power Scheduler - step detection down when the node runs hot or busy
+Samples CPU load (1-minute load average per core) and the hottest zone under
+/sys/class/thermal, and picks a performance tier: model input size, frame
+stride and session length cap. It steps down as
+soon as a threshold is crossed and steps back up one tier at a time once
+conditions have stayed below the threshold (minus a margin) for a while, so a
+passively cooled enclosure settles on a sustainable tier instead of bouncing
+off the CPU's thermal throttling.
+
+On machines without these files (e.g. Windows) the scheduler stays on the
+full tier.
+"""
+
+import glob
+import os
+import time
+from collections import namedtuple
+
+Tier = namedtuple('Tier', 'name imgsz frame_stride max_session_s')
+
+# Fastest first. max_session_s caps run_detection()'s max_duration (None = no cap).
+TIERS = (
+    Tier("full",     640, 1, None),
+    Tier("reduced",  480, 1, None),
+    Tier("eco",      320, 2, 8),
+    Tier("critical", 256, 4, 5),
+)
+
+# Entering tier i+1 when the value reaches THRESHOLDS[i]
+TEMP_THRESHOLDS_C = (65.0, 72.0, 80.0)
+# Load average per core. Inference alone keeps every core busy (~1.0), so only
+# oversubscription (other work queueing for the CPU) counts as pressure.
+LOAD_THRESHOLDS = (1.25, 1.75, 2.5)
+TEMP_MARGIN_C = 5.0                   # Must drop this far below a threshold to recover
+LOAD_MARGIN = 0.25
+RECOVER_HOLD_S = 30                   # ...and stay there this long
+SAMPLE_INTERVAL = 2.0                 # Seconds between sensor reads
+
+THERMAL_ROOT = "/sys/class/thermal"
+
+# ================== Sensors ==================
+def read_max_temperature(thermal_root=THERMAL_ROOT):
+    """Hottest thermal zone in °C, or None if there are none"""
+    temps = []
+    for path in glob.glob(os.path.join(thermal_root, "thermal_zone*", "temp")):
+        try:
+            with open(path) as f:
+                temps.append(int(f.read().strip()) / 1000.0)
+        except (OSError, ValueError):
+            continue
+    return max(temps) if temps else None
+
+def read_cpu_load():
+    """1-minute load average per core, or None where it isn't available"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+def pressure_level(value, thresholds, margin=0.0):
+    """Number of thresholds `value` has reached (each lowered by `margin`)"""
+    if value is None:
+        return 0
+    return sum(1 for t in thresholds if value >= t - margin)
+
+# ================== Scheduler ==================
+class ResourceScheduler:
+    """Pick a performance tier from CPU load and temperature, with hysteresis"""
+    def __init__(self, enabled=True, thermal_root=THERMAL_ROOT, sample_interval=SAMPLE_INTERVAL,
+                 recover_hold_s=RECOVER_HOLD_S):
+        self.enabled = enabled
+        self.thermal_root = thermal_root
+        self.sample_interval = sample_interval
+        self.recover_hold_s = recover_hold_s
+        self.level = 0
+        self.temperature = None
+        self.load = None
+        self.transitions = []       # (time.time(), from_tier, to_tier, temperature, load)
+        self.time_in_tier = {tier.name: 0.0 for tier in TIERS}
+        self._last_sample = None
+        self._tier_since = time.monotonic()
+        self._recover_since = None
+
+    @property
+    def tier(self):
+        return TIERS[self.level]
+
+    def update(self):
+        """Re-sample (at most every sample_interval seconds) and change tier if needed"""
+        if not self.enabled:
+            return self.tier
+        now = time.monotonic()
+        if self._last_sample is not None and now - self._last_sample < self.sample_interval:
+            return self.tier
+        self._last_sample = now
+        self.temperature = read_max_temperature(self.thermal_root)
+        self.load = read_cpu_load()
+
+        target = max(pressure_level(self.temperature, TEMP_THRESHOLDS_C),
+                     pressure_level(self.load, LOAD_THRESHOLDS))
+        if target > self.level:
+            # Step straight down to where conditions say we should be
+            self._recover_since = None
+            self._set_level(target, now)
+            return self.tier
+
+        # Only recover once both readings are clearly below the current tier's threshold
+        recover_to = max(pressure_level(self.temperature, TEMP_THRESHOLDS_C, TEMP_MARGIN_C),
+                         pressure_level(self.load, LOAD_THRESHOLDS, LOAD_MARGIN))
+        if recover_to < self.level:
+            if self._recover_since is None:
+                self._recover_since = now
+            elif now - self._recover_since >= self.recover_hold_s:
+                self._recover_since = now
+                self._set_level(self.level - 1, now)
+        else:
+            self._recover_since = None
+        return self.tier
+
+    def _set_level(self, level, now):
+        old = self.tier
+        self.time_in_tier[old.name] += now - self._tier_since
+        self._tier_since = now
+        self.level = level
+        self.transitions.append((time.time(), old.name, self.tier.name, self.temperature, self.load))
+        temp = "-" if self.temperature is None else f"{self.temperature:.1f}°C"
+        load = "-" if self.load is None else f"{self.load:.2f}"
+        arrow = "🔻" if level > TIERS.index(old) else "🔺"
+        print(f"{arrow} Performance tier {old.name} -> {self.tier.name} (temp {temp}, load/core {load})")
+
+    def session_limit(self, max_duration):
+        """Cap a detection session's max_duration for the current tier"""
+        cap = self.tier.max_session_s
+        if cap is None or max_duration is None:
+            return max_duration if cap is None else cap
+        return min(max_duration, cap)
+
+    def metrics(self):
+        """Current tier, time spent per tier and every transition so far"""
+        time_in_tier = dict(self.time_in_tier)
+        time_in_tier[self.tier.name] += time.monotonic() - self._tier_since
+        return {
+            'tier': self.tier.name,
+            'temperature_c': self.temperature,
+            'cpu_load': None if self.load is None else round(self.load, 3),
+            'transitions': len(self.transitions),
+            'time_in_tier_s': {name: round(seconds, 1) for name, seconds in time_in_tier.items()},
+            'history': [
+                {'time': round(t, 3), 'from': old, 'to': new, 'temperature_c': temp,
+                 'cpu_load': None if load is None else round(load, 3)}
+                for t, old, new, temp, load in self.transitions
+            ],
+        }
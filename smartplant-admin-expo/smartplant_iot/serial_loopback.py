@@ -0,0 +1,241 @@
+"""
+Serial Loopback Tool - exercise the serial decoder without an ESP32
+Emulates motion_sensor.ino (text or binary protocol) on one end of a pty and
+reads the other end through serial_protocol.SerialReader, like main.py does.
+
+    python serial_loopback.py            # decoder check over a pty (both protocols)
+    python serial_loopback.py --bench    # bytes on wire, parse CPU and trigger latency
+
+Linux/macOS only (needs a pty).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import tty
+
+import serial
+
+import gps_parser
+import serial_protocol as sp
+from iot_payloads import GPSData, parse_sensor_line
+
+BAUD_RATE = 115200
+SIM_LAT = 1.5258
+SIM_LNG = 110.3542
+SIM_ALTITUDE = 20.0
+SIM_SPEED = 0.0
+SIM_SATELLITES = 8
+
+# ================== ESP32 Emulation ==================
+def text_cycle(seconds, temperature, humidity):
+    """One 10 s DHT + GPS report, byte-for-byte as the text sketch prints it"""
+    lines = [
+        "========================================",
+        f"[Time: {seconds}s]",
+        f"Temperature: {temperature:.2f} °C  |  Humidity: {humidity:.2f} %",
+        "GPS: SIMULATION MODE",
+        f"GPS_LAT: {SIM_LAT:.6f}",
+        f"GPS_LNG: {SIM_LNG:.6f}",
+        f"GPS_ALTITUDE: {SIM_ALTITUDE:.2f} m",
+        f"GPS_SPEED: {SIM_SPEED:.2f} km/h",
+        f"GPS_SATELLITES: {SIM_SATELLITES}",
+        "========================================",
+        "",
+    ]
+    return "".join(line + "\r\n" for line in lines).encode('utf-8')
+
+def text_trigger():
+    return b"[MOTION DETECTED!]\r\nTRIGGER_CAMERA\r\n"
+
+def binary_cycle(seconds, temperature, humidity):
+    millis = seconds * 1000
+    return (sp.encode_sensor(millis, temperature, humidity) +
+            sp.encode_gps(millis, SIM_LAT, SIM_LNG, SIM_ALTITUDE, SIM_SPEED, SIM_SATELLITES, simulated=True))
+
+def binary_trigger(seq):
+    return sp.encode_trigger(seq * 1000, seq)
+
+BOOT_BANNER = (b"\r\n=== Multi-Sensor System Starting ===\r\n"
+               b"DHT11 sensor initialized.\r\n"
+               b"PIR sensor ready!\r\n")
+
+# ================== pty Helpers ==================
+@contextlib.contextmanager
+def pty_serial():
+    """Yield (master_fd, pyserial port on the slave end)"""
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(master_fd)
+    ser = serial.Serial(os.ttyname(slave_fd), BAUD_RATE, timeout=0.2)
+    try:
+        yield master_fd, ser
+    finally:
+        ser.close()
+        os.close(slave_fd)
+        os.close(master_fd)
+
+def read_items(reader, ser, expected_count, timeout=5.0):
+    items = []
+    deadline = time.time() + timeout
+    while len(items) < expected_count and time.time() < deadline:
+        items.extend(reader.poll(ser))
+    return items
+
+# ================== Decoder Check ==================
+def check_protocol(binary):
+    """Send a scripted session through the pty and verify what comes out"""
+    name = "binary" if binary else "text"
+    cycles = [(10, 25.5, 60.0), (20, 25.75, 61.25), (30, -3.5, 99.99)]
+
+    stream = bytearray(BOOT_BANNER)
+    expected = ["", "=== Multi-Sensor System Starting ===", "DHT11 sensor initialized.", "PIR sensor ready!"]
+    for i, (seconds, temp, hum) in enumerate(cycles):
+        if binary:
+            frame = binary_cycle(seconds, temp, hum)
+            if i == 1:
+                # Corrupt the GPS frame's payload: CRC must reject it, decoding must recover
+                corrupt = bytearray(frame)
+                corrupt[-5] ^= 0x55
+                frame = bytes(corrupt)
+            stream += frame + binary_trigger(i)
+            expected.append(sp.SensorRecord(seconds * 1000, temp, hum, True))
+            if i != 1:
+                expected.append(sp.GPSRecord(seconds * 1000, SIM_LAT, SIM_LNG, SIM_ALTITUDE,
+                                             SIM_SPEED, SIM_SATELLITES, True))
+            expected.append(sp.TriggerRecord(i * 1000, i))
+        else:
+            text = text_cycle(seconds, temp, hum)
+            stream += text + text_trigger()
+            expected.extend(text.decode('utf-8').split("\r\n")[:-1])
+            expected.extend(["[MOTION DETECTED!]", "TRIGGER_CAMERA"])
+
+    reader = sp.SerialReader()
+    with pty_serial() as (master_fd, ser):
+        # Dribble the bytes in small writes, like a real UART would deliver them
+        for i in range(0, len(stream), 7):
+            os.write(master_fd, stream[i:i + 7])
+        items = read_items(reader, ser, len(expected))
+
+    ok = True
+    if len(items) != len(expected):
+        print(f"❌ {name}: expected {len(expected)} items, got {len(items)}")
+        ok = False
+    for got, want in zip(items, expected):
+        if isinstance(want, tuple):
+            # Fixed-point fields: compare within their resolution
+            same = type(got) is type(want) and all(
+                abs(g - w) < 1e-6 if isinstance(w, float) else g == w for g, w in zip(got, want))
+        else:
+            same = got == want
+        if not same:
+            print(f"❌ {name}: expected {want!r}, got {got!r}")
+            ok = False
+            break
+
+    expected_bad = 1 if binary else 0
+    if reader.bad_frames != expected_bad:
+        print(f"❌ {name}: expected {expected_bad} rejected frame(s), got {reader.bad_frames}")
+        ok = False
+    if reader.mode != name:
+        print(f"❌ {name}: reader detected '{reader.mode}' protocol")
+        ok = False
+
+    if ok:
+        print(f"✅ {name} protocol: {len(items)} items decoded correctly over pty")
+    return ok
+
+# ================== Benchmarks ==================
+def bench_wire_bytes():
+    text = len(text_cycle(10, 25.5, 60.0))
+    binary = len(binary_cycle(10, 25.5, 60.0))
+    text_trig = len(text_trigger())
+    bin_trig = len(binary_trigger(1))
+    # 10 bits per byte on the wire (start + 8 data + stop)
+    byte_ms = 10 / BAUD_RATE * 1000
+    print("\n📏 Bytes on the wire")
+    print(f"  Sensor+GPS report:  text {text:4d} B   binary {binary:4d} B   ({text / binary:.1f}x smaller)")
+    print(f"  Trigger:            text {text_trig:4d} B   binary {bin_trig:4d} B")
+    print(f"  Trigger wire time @ {BAUD_RATE} baud: text {text_trig * byte_ms:.2f} ms   "
+          f"binary {bin_trig * byte_ms:.2f} ms")
+
+def bench_parse_cpu(iterations=2000):
+    """CPU time per report, from raw bytes to a GPSData and sensor dict (as main.py keeps)"""
+    gps = GPSData()
+    sensor_data = {'temperature': None, 'humidity': None}
+
+    # Pre-set the address so GPSData.update() doesn't reverse-geocode during the bench
+    gps.address = "loopback"
+    text = text_cycle(10, 25.5, 60.0)
+    binary = binary_cycle(10, 25.5, 60.0)
+
+    def run_text():
+        reader = sp.SerialReader()
+        for line in reader.feed(text):
+            gps_parser.parse_gps_line(line, gps)
+            if "Temperature:" in line or "Humidity:" in line:
+                parse_sensor_line(line, sensor_data)
+
+    def run_binary():
+        reader = sp.SerialReader()
+        for record in reader.feed(binary):
+            if isinstance(record, sp.SensorRecord):
+                sensor_data['temperature'] = record.temperature
+                sensor_data['humidity'] = record.humidity
+            elif isinstance(record, sp.GPSRecord):
+                gps.update(lat=record.lat, lng=record.lng, altitude=record.altitude,
+                           speed=record.speed, satellites=record.satellites)
+
+    print("\n⏱️  Parse CPU per sensor+GPS report (includes the parsers' debug prints for text)")
+    for label, func in (("text", run_text), ("binary", run_binary)):
+        # The text parsers print every line; send that to a buffer, not the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.process_time()
+            for _ in range(iterations):
+                func()
+            elapsed = time.process_time() - start
+        print(f"  {label:<7} {elapsed / iterations * 1e6:8.1f} µs")
+
+def bench_trigger_latency(runs=200):
+    """Time from writing a trigger to the pty until the reader yields it"""
+    print("\n🚨 Trigger latency over pty (write -> decoded trigger)")
+    for label, payload, is_trigger in (
+        ("text", text_trigger(), lambda item: item == "TRIGGER_CAMERA"),
+        ("binary", binary_trigger(1), lambda item: isinstance(item, sp.TriggerRecord)),
+    ):
+        latencies = []
+        reader = sp.SerialReader()
+        with pty_serial() as (master_fd, ser):
+            for _ in range(runs):
+                sent = time.perf_counter()
+                os.write(master_fd, payload)
+                found = False
+                while not found:
+                    found = any(is_trigger(item) for item in reader.poll(ser))
+                latencies.append((time.perf_counter() - sent) * 1000)
+        latencies.sort()
+        print(f"  {label:<7} p50 {statistics.median(latencies):6.3f} ms   "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:6.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial protocol loopback check / benchmark")
+    parser.add_argument("--bench", action="store_true", help="Measure bytes, parse CPU and trigger latency")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("🔁 SERIAL LOOPBACK")
+    print("="*60)
+
+    text_ok = check_protocol(binary=False)
+    binary_ok = check_protocol(binary=True)
+    if args.bench:
+        bench_wire_bytes()
+        bench_parse_cpu()
+        bench_trigger_latency()
+    sys.exit(0 if text_ok and binary_ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Serial Protocol - decode the ESP32's serial output
+Handles both the human-readable text lines and the optional binary mode
+(BINARY_PROTOCOL in motion_sensor.ino), auto-detecting which one is on the wire.
+
+Binary frames:
+    0x00 | COBS( type:u8 | payload | crc16:u16 ) | 0x00
+
+CRC16 is CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over type + payload.
+All fields are little-endian. Payload layouts:
+
+    SENSOR  (0x01)  millis:u32  temp_centi_c:i16  humidity_centi_pct:u16  flags:u8
+    GPS     (0x02)  millis:u32  lat_e7:i32  lng_e7:i32  altitude_dm:i16  speed_centi_kmh:u16
+                    satellites:u8  flags:u8
+    TRIGGER (0x03)  millis:u32  seq:u16
+"""
+
+import binascii
+import struct
+from collections import namedtuple
+
+# ================== Record Types ==================
+REC_SENSOR = 0x01
+REC_GPS = 0x02
+REC_TRIGGER = 0x03
+
+SENSOR_FLAG_OK = 0x01       # DHT11 read succeeded
+GPS_FLAG_SIMULATED = 0x01   # Coordinates come from the simulation constants
+
+SENSOR_STRUCT = struct.Struct('<IhHB')
+GPS_STRUCT = struct.Struct('<IiihHBB')
+TRIGGER_STRUCT = struct.Struct('<IH')
+CRC_STRUCT = struct.Struct('<H')
+
+SensorRecord = namedtuple('SensorRecord', 'millis temperature humidity ok')
+GPSRecord = namedtuple('GPSRecord', 'millis lat lng altitude speed satellites simulated')
+TriggerRecord = namedtuple('TriggerRecord', 'millis seq')
+
+# Longest valid frame on the wire (type + largest payload + crc, plus COBS overhead)
+MAX_FRAME_LEN = 1 + GPS_STRUCT.size + CRC_STRUCT.size + 2
+# Text lines longer than this without a newline are dropped (e.g. line noise)
+MAX_LINE_LEN = 512
+
+# ================== COBS / CRC ==================
+def crc16(data):
+    """CRC-16/CCITT-FALSE"""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+def cobs_encode(data):
+    """Consistent Overhead Byte Stuffing: remove all zero bytes from `data`"""
+    out = bytearray([0])
+    code_index = 0
+    code = 1
+    for byte in data:
+        if byte == 0:
+            out[code_index] = code
+            code_index = len(out)
+            out.append(0)
+            code = 1
+        else:
+            out.append(byte)
+            code += 1
+            if code == 0xFF:
+                out[code_index] = code
+                code_index = len(out)
+                out.append(0)
+                code = 1
+    out[code_index] = code
+    return bytes(out)
+
+def cobs_decode(data):
+    """Reverse cobs_encode(). Raises ValueError on malformed input."""
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        code = data[i]
+        if code == 0 or i + code > len(data):
+            raise ValueError("Malformed COBS block")
+        out += data[i + 1:i + code]
+        i += code
+        if code < 0xFF and i < len(data):
+            out.append(0)
+    return bytes(out)
+
+# ================== Encoding (used by the loopback tool) ==================
+def encode_frame(record_type, payload):
+    """Build a complete on-the-wire frame, including both 0x00 delimiters"""
+    body = bytes([record_type]) + payload
+    body += CRC_STRUCT.pack(crc16(body))
+    return b'\x00' + cobs_encode(body) + b'\x00'
+
+def encode_sensor(millis, temperature, humidity, ok=True):
+    payload = SENSOR_STRUCT.pack(millis, round(temperature * 100), round(humidity * 100),
+                                 SENSOR_FLAG_OK if ok else 0)
+    return encode_frame(REC_SENSOR, payload)
+
+def encode_gps(millis, lat, lng, altitude, speed, satellites, simulated=False):
+    payload = GPS_STRUCT.pack(millis, round(lat * 1e7), round(lng * 1e7), round(altitude * 10),
+                              round(speed * 100), satellites, GPS_FLAG_SIMULATED if simulated else 0)
+    return encode_frame(REC_GPS, payload)
+
+def encode_trigger(millis, seq):
+    return encode_frame(REC_TRIGGER, TRIGGER_STRUCT.pack(millis, seq))
+
+# ================== Decoding ==================
+def decode_frame(frame):
+    """Decode one COBS frame (without delimiters) into a typed record, or None"""
+    try:
+        body = cobs_decode(frame)
+    except ValueError:
+        return None
+    if len(body) < 1 + CRC_STRUCT.size:
+        return None
+    (crc,) = CRC_STRUCT.unpack_from(body, len(body) - CRC_STRUCT.size)
+    body = body[:-CRC_STRUCT.size]
+    if crc16(body) != crc:
+        return None
+
+    record_type, payload = body[0], body[1:]
+    try:
+        if record_type == REC_SENSOR:
+            millis, temp, hum, flags = SENSOR_STRUCT.unpack(payload)
+            return SensorRecord(millis, temp / 100.0, hum / 100.0, bool(flags & SENSOR_FLAG_OK))
+        if record_type == REC_GPS:
+            millis, lat, lng, alt, speed, sats, flags = GPS_STRUCT.unpack(payload)
+            return GPSRecord(millis, lat / 1e7, lng / 1e7, alt / 10.0, speed / 100.0, sats,
+                             bool(flags & GPS_FLAG_SIMULATED))
+        if record_type == REC_TRIGGER:
+            millis, seq = TRIGGER_STRUCT.unpack(payload)
+            return TriggerRecord(millis, seq)
+    except struct.error:
+        return None
+    return None
+
+class SerialReader:
+    """Split a serial byte stream into text lines (str) and binary records.
+
+    Text never contains 0x00, so a zero byte starts a binary frame and the next
+    zero byte ends it; everything else is newline-delimited text. Only a frame
+    that decodes counts as ended: after a bad one, its closing zero is taken as
+    the start of the next frame, so a lost byte costs one frame, not the phase. That lets the
+    boot banner (always text) and binary records share one port, and lets
+    main.py fall back to text automatically when the sketch isn't in binary mode.
+    """
+    def __init__(self):
+        self._text = bytearray()
+        self._frame = bytearray()
+        self._in_frame = False
+        self.mode = "text"          # Becomes "binary" once a valid frame is seen
+        self.bad_frames = 0
+        self.bytes_received = 0
+
+    def feed(self, data):
+        """Consume raw bytes and return a list of decoded str lines / records"""
+        items = []
+        self.bytes_received += len(data)
+        for byte in data:
+            if self._in_frame:
+                if byte != 0:
+                    self._frame.append(byte)
+                    if len(self._frame) > MAX_FRAME_LEN:
+                        # Lost sync - drop the frame and go back to text
+                        self.bad_frames += 1
+                        self._frame.clear()
+                        self._in_frame = False
+                    continue
+                if not self._frame:
+                    continue  # Leading delimiter (or back-to-back delimiters)
+                record = decode_frame(bytes(self._frame))
+                self._frame.clear()
+                if record is None:
+                    # Truncated or corrupted: this zero was really the next frame's opening
+                    # delimiter, so stay in frame mode until a frame decodes again
+                    self.bad_frames += 1
+                else:
+                    self._in_frame = False
+                    self.mode = "binary"
+                    items.append(record)
+            elif byte == 0:
+                self._in_frame = True
+                self._text.clear()
+            elif byte == 0x0A:
+                line = self._text.decode('utf-8', errors='ignore').strip()
+                self._text.clear()
+                items.append(line)
+            else:
+                self._text.append(byte)
+                if len(self._text) > MAX_LINE_LEN:
+                    self._text.clear()
+        return items
+
+    def poll(self, ser):
+        """Read whatever the port has (waiting up to its timeout for one byte) and decode it"""
+        data = ser.read(ser.in_waiting or 1)
+        return self.feed(data) if data else []
@@ -0,0 +1,241 @@
+"""
+Serial Supervisor - keep the Arduino connection alive across resets and unplugs
+Remembers the board's USB identity (VID/PID/serial number), notices when the
+port goes away, watches for the board to come back (on any port name) and
+reopens it, so ingestion resumes without restarting main.py.
+"""
+
+import time
+from collections import namedtuple
+
+import serial
+import serial.tools.list_ports
+
+from serial_protocol import SerialReader
+
+BAUD_RATE = 115200
+
+# USB-serial bridges and boards the node is known to use (VID, PID) -> name
+KNOWN_BOARDS = {
+    (0x1A86, 0x7523): "CH340",
+    (0x1A86, 0x55D4): "CH9102",
+    (0x10C4, 0xEA60): "CP210x",
+    (0x0403, 0x6001): "FTDI FT232R",
+    (0x0403, 0x6015): "FTDI FT231X",
+    (0x303A, 0x1001): "ESP32-S3 USB",
+}
+KNOWN_VENDORS = {0x2341: "Arduino", 0x2A03: "Arduino"}
+# Fallback for ports without USB IDs (the original substring match)
+DESCRIPTION_HINTS = ('USB', 'Arduino', 'CH340')
+
+RECONNECT_POLL_INTERVAL = 0.25  # Seconds between port scans while disconnected
+STALL_TIMEOUT = 30              # No data for this long -> check the port still exists
+
+# ================== Board Identity ==================
+class BoardIdentity(namedtuple('BoardIdentity', 'vid pid serial_number device')):
+    """USB identity of the board, used to find it again after a re-plug"""
+
+    @classmethod
+    def from_port_info(cls, info):
+        return cls(info.vid, info.pid, info.serial_number, info.device)
+
+    @classmethod
+    def from_device(cls, device):
+        """Identity of an already-known port name (device-only if it isn't listed)"""
+        for info in serial.tools.list_ports.comports():
+            if info.device == device:
+                return cls.from_port_info(info)
+        return cls(None, None, None, device)
+
+    def match_score(self, info):
+        """How well a listed port matches: 3 = serial number, 2 = VID/PID, 1 = port name, 0 = no"""
+        if self.serial_number and info.serial_number == self.serial_number:
+            return 3
+        if self.vid is not None and (info.vid, info.pid) == (self.vid, self.pid) and not self.serial_number:
+            return 2
+        if info.device == self.device and (self.vid is None or info.vid in (None, self.vid)):
+            return 1
+        return 0
+
+    def has_usb_ids(self):
+        return self.vid is not None
+
+    def describe(self):
+        if self.vid is None:
+            return self.device
+        name = KNOWN_BOARDS.get((self.vid, self.pid)) or KNOWN_VENDORS.get(self.vid) or "USB serial"
+        serial_part = f" SN={self.serial_number}" if self.serial_number else ""
+        return f"{name} {self.vid:04X}:{self.pid:04X}{serial_part} on {self.device}"
+
+def board_priority(info):
+    """0 = known board, 1 = known vendor, 2 = description hint, None = not a candidate"""
+    if (info.vid, info.pid) in KNOWN_BOARDS:
+        return 0
+    if info.vid in KNOWN_VENDORS:
+        return 1
+    if any(hint in (info.description or '') for hint in DESCRIPTION_HINTS):
+        return 2
+    return None
+
+def find_board(identity=None):
+    """Return the ListPortInfo of the board (best match for `identity`, if given) or None"""
+    ports = serial.tools.list_ports.comports()
+    if identity is not None:
+        scored = [(identity.match_score(info), info) for info in ports]
+        scored = [item for item in scored if item[0] > 0]
+        return max(scored, key=lambda item: item[0])[1] if scored else None
+
+    candidates = [(board_priority(info), info) for info in ports]
+    candidates = [item for item in candidates if item[0] is not None]
+    return min(candidates, key=lambda item: item[0])[1] if candidates else None
+
+# ================== Metrics ==================
+class SupervisorMetrics:
+    """Disconnect count, time to reopen the port and the resulting data gap"""
+    def __init__(self):
+        self.disconnects = 0
+        self.reconnect_times = []   # Seconds from disconnect detected to port reopened
+        self.data_gaps = []         # Seconds from last byte before to first byte after
+
+    def summary(self):
+        def stats(values):
+            if not values:
+                return None
+            return {'mean_s': round(sum(values) / len(values), 3), 'max_s': round(max(values), 3)}
+        return {
+            'disconnects': self.disconnects,
+            'reconnects': len(self.reconnect_times),
+            'reconnect_time': stats(self.reconnect_times),
+            'data_gap': stats(self.data_gaps),
+        }
+
+# ================== Supervisor ==================
+class SerialSupervisor:
+    """Owns the serial port: reads through a SerialReader and reconnects on failure
+
+    `device` may be None, in which case wait_for_board() picks up the first
+    known board that is plugged in.
+    """
+    def __init__(self, device=None, baud_rate=BAUD_RATE, poll_interval=RECONNECT_POLL_INTERVAL,
+                 stall_timeout=STALL_TIMEOUT):
+        self.identity = BoardIdentity.from_device(device) if device else None
+        self.baud_rate = baud_rate
+        self.poll_interval = poll_interval
+        self.stall_timeout = stall_timeout
+        self.metrics = SupervisorMetrics()
+        self.reader = SerialReader()
+        self.ser = None
+        self.last_data_time = None
+        self._disconnected_at = None
+        self._gap_started_at = None
+
+    def _open(self, device):
+        ser = serial.Serial()
+        ser.port = device
+        ser.baudrate = self.baud_rate
+        ser.timeout = 1
+        # Don't toggle DTR/RTS on open: that would reset the ESP32 and cost another boot
+        ser.dtr = False
+        ser.rts = False
+        ser.open()
+        return ser
+
+    def open(self, init_delay=2):
+        """First connection. Raises serial.SerialException if the port can't be opened."""
+        self.ser = self._open(self.identity.device)
+        print(f"Connected to Arduino: {self.identity.describe()}")
+        time.sleep(init_delay)  # Wait for Arduino to initialize
+        self.last_data_time = time.monotonic()
+
+    def poll(self):
+        """Return decoded items (text lines / records); reconnects transparently"""
+        if self.ser is None:
+            self._reconnect()
+
+        try:
+            items = self.reader.poll(self.ser)
+        except (serial.SerialException, OSError) as e:
+            self._on_disconnect(e)
+            return []
+
+        now = time.monotonic()
+        if items:
+            if self._gap_started_at is not None:
+                gap = now - self._gap_started_at
+                self.metrics.data_gaps.append(gap)
+                self._gap_started_at = None
+                print(f"📶 Data flowing again after a {gap:.2f}s gap")
+            self.last_data_time = now
+        elif self.last_data_time is not None and now - self.last_data_time > self.stall_timeout:
+            # Some drivers keep a dead handle open; check the board is still plugged in
+            if find_board(self.identity) is None:
+                self._on_disconnect("port disappeared")
+            else:
+                self.last_data_time = now
+        return items
+
+    def _on_disconnect(self, reason):
+        print(f"\n⚠️  Lost connection to Arduino ({reason}) - waiting for it to come back...")
+        self.metrics.disconnects += 1
+        self._disconnected_at = time.monotonic()
+        if self._gap_started_at is None:
+            self._gap_started_at = self.last_data_time or self._disconnected_at
+        try:
+            self.ser.close()
+        except (serial.SerialException, OSError):
+            pass
+        self.ser = None
+
+    def _find_device(self):
+        """Port name the board is on right now, or None"""
+        info = find_board(self.identity)
+        if info is not None:
+            if self.identity is None or not self.identity.has_usb_ids():
+                # First sighting (or a port that had no USB IDs before): remember it fully
+                self.identity = BoardIdentity.from_port_info(info)
+            return info.device
+        if self.identity is not None and not self.identity.has_usb_ids():
+            # Not a USB device (built-in UART, pty): all we can do is retry the same name
+            return self.identity.device
+        return None
+
+    def _reconnect(self):
+        """Block until the board is back and reopened"""
+        last_notice = time.monotonic()
+        while True:
+            device = self._find_device()
+            if device is not None:
+                try:
+                    self.ser = self._open(device)
+                except (serial.SerialException, OSError):
+                    # The OS may list the port slightly before it can be opened
+                    self.ser = None
+                else:
+                    break
+
+            if time.monotonic() - last_notice >= 10:
+                target = self.identity.describe() if self.identity else "a known board"
+                print(f"⏳ Still waiting for {target}...")
+                last_notice = time.monotonic()
+            time.sleep(self.poll_interval)
+
+        # The board may come back on a different port name
+        self.identity = self.identity._replace(device=device)
+        reconnect_time = time.monotonic() - self._disconnected_at
+        self.metrics.reconnect_times.append(reconnect_time)
+        # Drop any half-received line/frame from before the disconnect
+        self.reader = SerialReader()
+        print(f"🔌 Connected to {self.identity.describe()} in {reconnect_time:.2f}s")
+
+    def wait_for_board(self):
+        """Block until a (matching) board is plugged in, then use it like open()"""
+        print("🔎 Waiting for the Arduino to be plugged in...")
+        self._disconnected_at = time.monotonic()
+        self._reconnect()
+        self.metrics.reconnect_times.pop()  # The first plug-in is not a reconnect
+        self.last_data_time = time.monotonic()
+
+    def close(self):
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
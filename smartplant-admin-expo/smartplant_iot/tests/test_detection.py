@@ -0,0 +1,114 @@
+"""
+Two-tier detection against a stand-in model that keeps call arguments between
+calls the way Ultralytics does (they are merged into the predictor's args).
+"""
+
+import unittest
+from unittest import mock
+
+try:
+    import main
+except ImportError as e:    # ultralytics / opencv / pyserial not installed
+    main = None
+    IMPORT_ERROR = str(e)
+
+PERSON = 0
+CAR = 2
+
+class FakeImage:
+    """Just enough of a numpy frame for detect_frame(): shape and 2-D slicing"""
+    def __init__(self, width, height):
+        self.shape = (height, width, 3)
+
+    def __getitem__(self, index):
+        rows, cols = index
+        return FakeImage(cols.stop - cols.start, rows.stop - rows.start)
+
+class FakeBox:
+    def __init__(self, x1, y1, x2, y2, conf, cls):
+        self.xyxy = [(x1, y1, x2, y2)]
+        self.conf = [conf]
+        self.cls = [cls]
+
+class FakeResult:
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.speed = {'preprocess': 1.0, 'inference': 2.0, 'postprocess': 0.5}
+
+class StickyModel:
+    """Every frame shows a person and a car; honours (and remembers) classes/conf"""
+    def __init__(self):
+        self.args = {'imgsz': 640, 'conf': 0.25, 'classes': None}
+        self.calls = []
+
+    def __call__(self, img, stream=False, verbose=True, **kwargs):
+        self.args.update(kwargs)
+        self.calls.append(dict(self.args))
+        boxes = [FakeBox(100, 100, 200, 400, 0.9, PERSON), FakeBox(300, 300, 500, 400, 0.8, CAR)]
+        boxes = [b for b in boxes
+                 if b.conf[0] >= self.args['conf']
+                 and (self.args['classes'] is None or b.cls[0] in self.args['classes'])]
+        return iter([FakeResult(boxes)])
+
+class FakeCapture:
+    """A fixed number of frames, then end of input"""
+    def __init__(self, frames):
+        self.remaining = frames
+
+    def read(self):
+        if not self.remaining:
+            return False, None
+        self.remaining -= 1
+        return True, FakeImage(640, 480)
+
+class FixedTierScheduler:
+    def __init__(self, tier):
+        self.tier = tier
+
+    def update(self):
+        return self.tier
+
+@unittest.skipIf(main is None, "main.py dependencies not installed")
+class StrideTest(unittest.TestCase):
+    def test_first_frame_inferred_then_every_stride(self):
+        model = StickyModel()
+        stats = main.DetectionStats()
+        alerts = []
+        tier = main.resource_scheduler.tier._replace(frame_stride=4)
+        with mock.patch.object(main, "cv2"):    # Drawing only
+            main.detection_loop(FakeCapture(9), model, max_duration=None, no_person_timeout=None,
+                                show_window=False, verbose=False, stats=stats, mode="single",
+                                on_person=alerts.append, scheduler=FixedTierScheduler(tier))
+
+        self.assertEqual(len(model.calls), 3)           # Frames 0, 4 and 8
+        self.assertEqual(stats.skipped_frames, 6)
+        self.assertEqual(stats.frames, 9)
+        self.assertEqual(stats.first_person_frame, 0)
+        self.assertEqual(alerts, [0.9])
+
+@unittest.skipIf(main is None, "main.py dependencies not installed")
+class TwoTierDetectionTest(unittest.TestCase):
+    def test_scan_keeps_other_classes_after_confirmation(self):
+        model = StickyModel()
+        frame = FakeImage(1280, 720)
+        for _ in range(2):
+            detections, _, confirm_passes = main.detect_frame(model, frame, mode="two_tier", verbose=False)
+            self.assertEqual(confirm_passes, 1)
+            self.assertEqual(sorted(d[5] for d in detections), [PERSON, CAR])
+
+        scan, confirm, next_scan = model.calls[:3]
+        self.assertEqual(confirm['classes'], [PERSON])
+        self.assertIsNone(next_scan['classes'])
+        self.assertEqual(next_scan, scan)
+
+    def test_single_pass_uses_defaults_after_two_tier(self):
+        model = StickyModel()
+        frame = FakeImage(1280, 720)
+        main.detect_frame(model, frame, mode="two_tier", verbose=False)
+        detections, _, _ = main.detect_frame(model, frame, mode="single", verbose=False)
+        self.assertEqual(model.calls[-1], {'imgsz': main.DEFAULT_IMGSZ, 'conf': main.DEFAULT_CONF,
+                                           'classes': None})
+        self.assertEqual(len(detections), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+ResourceScheduler against a temporary thermal_root, with the CPU load and the
+clock under the test's control.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import power_scheduler
+from power_scheduler import ResourceScheduler, pressure_level, read_max_temperature
+
+class PressureLevelTest(unittest.TestCase):
+    def test_counts_thresholds_reached(self):
+        thresholds = (65.0, 72.0, 80.0)
+        self.assertEqual(pressure_level(None, thresholds), 0)
+        self.assertEqual(pressure_level(50.0, thresholds), 0)
+        self.assertEqual(pressure_level(65.0, thresholds), 1)
+        self.assertEqual(pressure_level(79.9, thresholds), 2)
+        self.assertEqual(pressure_level(95.0, thresholds), 3)
+
+    def test_margin_lowers_every_threshold(self):
+        thresholds = (65.0, 72.0, 80.0)
+        self.assertEqual(pressure_level(61.0, thresholds, margin=5.0), 1)
+        self.assertEqual(pressure_level(59.0, thresholds, margin=5.0), 0)
+
+class SchedulerTestCase(unittest.TestCase):
+    """A thermal_root with one zone, a fixed CPU load and a settable clock"""
+    def setUp(self):
+        self.thermal_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.thermal_root)
+        self.now = 1000.0
+        self.load = 0.1
+        for target, replacement in (("power_scheduler.time.monotonic", lambda: self.now),
+                                    ("power_scheduler.read_cpu_load", lambda: self.load)):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Tier transitions are printed; keep the test output clean
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def set_temperature(self, celsius, zone=0):
+        path = os.path.join(self.thermal_root, f"thermal_zone{zone}")
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "temp"), "w") as f:
+            f.write(f"{int(celsius * 1000)}\n")
+
+    def scheduler(self, **kwargs):
+        kwargs.setdefault("recover_hold_s", 30)
+        return ResourceScheduler(thermal_root=self.thermal_root, sample_interval=0, **kwargs)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class ReadTemperatureTest(SchedulerTestCase):
+    def test_hottest_zone_wins(self):
+        self.set_temperature(45.0, zone=0)
+        self.set_temperature(71.5, zone=1)
+        with open(os.path.join(self.thermal_root, "thermal_zone2"), "w"):
+            pass    # Not a zone directory: ignored
+        self.assertEqual(read_max_temperature(self.thermal_root), 71.5)
+
+    def test_no_zones(self):
+        self.assertIsNone(read_max_temperature(self.thermal_root))
+
+class ResourceSchedulerTest(SchedulerTestCase):
+    def test_cool_and_idle_stays_full(self):
+        self.set_temperature(50.0)
+        scheduler = self.scheduler()
+        self.assertEqual(scheduler.update().name, "full")
+        self.assertEqual(scheduler.transitions, [])
+
+    def test_steps_straight_down(self):
+        self.set_temperature(50.0)
+        scheduler = self.scheduler()
+        scheduler.update()
+        self.set_temperature(81.0)
+        self.assertEqual(scheduler.update().name, "critical")
+        self.assertEqual([(old, new) for _, old, new, _, _ in scheduler.transitions], [("full", "critical")])
+
+    def test_load_alone_steps_down(self):
+        self.set_temperature(50.0)
+        self.load = 1.8
+        self.assertEqual(self.scheduler().update().name, "eco")
+
+    def test_holds_then_recovers_one_tier_at_a_time(self):
+        self.set_temperature(75.0)
+        scheduler = self.scheduler()
+        self.assertEqual(scheduler.update().name, "eco")
+
+        # 60 °C is 5 °C below the first threshold: eco may recover, but only after the hold
+        self.set_temperature(60.0)
+        self.assertEqual(scheduler.update().name, "eco")
+        self.advance(29)
+        self.assertEqual(scheduler.update().name, "eco")
+        self.advance(1)
+        self.assertEqual(scheduler.update().name, "reduced")
+
+        # Not yet 5 °C below 65 °C, so reduced is held no matter how long
+        self.advance(60)
+        self.assertEqual(scheduler.update().name, "reduced")
+
+        self.set_temperature(50.0)
+        scheduler.update()
+        self.advance(30)
+        self.assertEqual(scheduler.update().name, "full")
+
+    def test_reading_inside_margin_resets_the_hold(self):
+        self.set_temperature(75.0)
+        scheduler = self.scheduler()
+        scheduler.update()
+        self.set_temperature(60.0)
+        scheduler.update()
+        self.advance(20)
+        self.set_temperature(70.0)     # Below 72 °C, but within the margin
+        scheduler.update()
+        self.set_temperature(60.0)
+        self.advance(20)
+        scheduler.update()
+        self.advance(20)
+        self.assertEqual(scheduler.update().name, "eco")
+        self.advance(10)
+        self.assertEqual(scheduler.update().name, "reduced")
+
+    def test_disabled_never_samples(self):
+        self.set_temperature(90.0)
+        scheduler = self.scheduler(enabled=False)
+        self.assertEqual(scheduler.update().name, "full")
+        self.assertIsNone(scheduler.temperature)
+
+    def test_session_limit(self):
+        self.set_temperature(50.0)
+        scheduler = self.scheduler()
+        scheduler.update()
+        self.assertEqual(scheduler.session_limit(10), 10)
+        self.assertIsNone(scheduler.session_limit(None))
+
+        self.set_temperature(81.0)
+        scheduler.update()
+        cap = power_scheduler.TIERS[-1].max_session_s
+        self.assertEqual(scheduler.session_limit(10), cap)
+        self.assertEqual(scheduler.session_limit(None), cap)
+        self.assertEqual(scheduler.session_limit(cap - 2), cap - 2)
+
+    def test_metrics_time_in_tier(self):
+        self.set_temperature(50.0)
+        scheduler = self.scheduler()
+        self.advance(10)
+        self.set_temperature(81.0)
+        scheduler.update()
+        self.advance(5)
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics['tier'], "critical")
+        self.assertEqual(metrics['time_in_tier_s']['full'], 10.0)
+        self.assertEqual(metrics['time_in_tier_s']['critical'], 5.0)
+        self.assertEqual(metrics['transitions'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+COBS framing, CRC checks and SerialReader's recovery from damaged frames.
+"""
+
+import unittest
+
+import serial_protocol as sp
+
+class CobsTest(unittest.TestCase):
+    CASES = [
+        b"",
+        b"\x00",
+        b"\x00\x00",
+        b"\x11\x22\x00\x33",
+        b"\x11\x00\x00\x00",
+        bytes(range(1, 255)),           # 254 non-zero bytes: exactly one full block
+        bytes(range(1, 256)),           # 255 non-zero bytes: spills into a second block
+        bytes(range(256)) * 2,
+    ]
+
+    def test_round_trip(self):
+        for data in self.CASES:
+            encoded = sp.cobs_encode(data)
+            self.assertNotIn(0, encoded, data)
+            self.assertEqual(sp.cobs_decode(encoded), data)
+
+    def test_overhead(self):
+        self.assertEqual(sp.cobs_encode(b"\x11\x22\x00\x33"), b"\x03\x11\x22\x02\x33")
+        # At most one code byte per 254 data bytes, plus the leading one
+        for data in self.CASES:
+            self.assertLessEqual(len(sp.cobs_encode(data)), len(data) + len(data) // 254 + 1)
+
+    def test_malformed(self):
+        for data in (b"\x05\x11\x22", b"\x00\x11", b"\x02\x11\x00"):
+            with self.assertRaises(ValueError, msg=data):
+                sp.cobs_decode(data)
+
+class DecodeFrameTest(unittest.TestCase):
+    def test_records_round_trip(self):
+        sensor = sp.decode_frame(sp.encode_sensor(1234, 25.5, 60.25)[1:-1])
+        self.assertEqual(sensor, sp.SensorRecord(1234, 25.5, 60.25, True))
+
+        gps = sp.decode_frame(sp.encode_gps(99, 1.5258, 110.3542, 20.5, 3.25, 7, simulated=True)[1:-1])
+        self.assertEqual(gps.satellites, 7)
+        self.assertTrue(gps.simulated)
+        self.assertAlmostEqual(gps.lat, 1.5258)
+        self.assertAlmostEqual(gps.lng, 110.3542)
+
+        trigger = sp.decode_frame(sp.encode_trigger(5, 42)[1:-1])
+        self.assertEqual(trigger, sp.TriggerRecord(5, 42))
+
+    def test_crc_mismatch_rejected(self):
+        body = bytes([sp.REC_TRIGGER]) + sp.TRIGGER_STRUCT.pack(5, 42)
+        good_crc = sp.crc16(body)
+        for crc in (good_crc ^ 0x0001, good_crc ^ 0x8000):
+            frame = sp.cobs_encode(body + sp.CRC_STRUCT.pack(crc))
+            self.assertIsNone(sp.decode_frame(frame))
+
+    def test_corrupted_payload_rejected(self):
+        frame = bytearray(sp.encode_sensor(1234, 25.5, 60.0)[1:-1])
+        frame[3] ^= 0x40
+        self.assertIsNone(sp.decode_frame(bytes(frame)))
+
+    def test_too_short_rejected(self):
+        self.assertIsNone(sp.decode_frame(sp.cobs_encode(b"\x03\x01")))
+
+class SerialReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.sensor = sp.encode_sensor(1, 25.5, 60.0)
+        self.trigger = sp.encode_trigger(2, 7)
+
+    def test_text_and_frames_share_the_stream(self):
+        reader = sp.SerialReader()
+        items = reader.feed(b"boot\r\n" + self.sensor + self.trigger + b"Temperature: 25\n")
+        self.assertEqual(items, ["boot", sp.SensorRecord(1, 25.5, 60.0, True), sp.TriggerRecord(2, 7),
+                                 "Temperature: 25"])
+        self.assertEqual(reader.mode, "binary")
+        self.assertEqual(reader.bad_frames, 0)
+
+    def test_byte_at_a_time(self):
+        reader = sp.SerialReader()
+        items = []
+        for byte in b"hi\n" + self.sensor + self.trigger:
+            items += reader.feed(bytes([byte]))
+        self.assertEqual(items, ["hi", sp.SensorRecord(1, 25.5, 60.0, True), sp.TriggerRecord(2, 7)])
+
+    def test_truncated_frame_keeps_phase(self):
+        reader = sp.SerialReader()
+        stream = (b"hello\n" + self.sensor[:9] + self.trigger + b"line2\n"
+                  + self.sensor[3:] + self.trigger + self.trigger)
+        trigger = sp.TriggerRecord(2, 7)
+        self.assertEqual(reader.feed(stream), ["hello", trigger, "line2", trigger, trigger])
+        self.assertEqual(reader.bad_frames, 1)
+
+    def test_corrupted_frame_costs_one_record(self):
+        damaged = bytearray(self.sensor)
+        damaged[4] ^= 0x40
+        reader = sp.SerialReader()
+        items = reader.feed(bytes(damaged) + self.trigger + b"after\n" + self.sensor)
+        self.assertEqual(items, [sp.TriggerRecord(2, 7), "after", sp.SensorRecord(1, 25.5, 60.0, True)])
+        self.assertEqual(reader.bad_frames, 1)
+
+    def test_missing_closing_delimiter_resyncs(self):
+        # No closing zero: the frame overruns MAX_FRAME_LEN and the reader falls back to text
+        reader = sp.SerialReader()
+        items = reader.feed(self.sensor[:-1] + b"x" * sp.MAX_FRAME_LEN + b"\nok\n" + self.trigger)
+        self.assertEqual(items[-2:], ["ok", sp.TriggerRecord(2, 7)])
+        self.assertEqual(reader.bad_frames, 1)
+
+if __name__ == "__main__":
+    unittest.main()